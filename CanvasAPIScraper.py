@@ -0,0 +1,339 @@
+"""
+Canvas API Scraper - Download course files through the Canvas REST API.
+
+Unlike CanvasScraper.py, this script does not drive a browser. It talks
+directly to the Canvas API using a personal access token (Account ->
+Settings -> New Access Token) and downloads every file it can see.
+
+All HTTP work is done with httpx coroutines dispatched concurrently on an
+HTTP/2 connection, so the per-request round-trip latency to the Canvas
+host is overlapped across courses and files instead of being paid
+serially, while listing requests multiplex over a single TLS handshake.
+"""
+
+import os
+import re
+import json
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+try:
+    # orjson decodes large Canvas payloads ~2-3x faster than stdlib json
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Configuration - the token comes from the environment so it never lives in
+# source control and each scraper process can use its own credentials
+BASE_URL = os.environ.get("CANVAS_BASE_URL", "https://canvas.instructure.com/api/v1")
+API_TOKEN = os.environ.get("CANVAS_TOKEN", "")
+DOWNLOAD_FOLDER = "Canvas_Downloads"
+
+# Cap on concurrent downloads. More parallelism than this buys nothing on a
+# single origin and risks tripping Canvas's 429/403 throttles.
+MAX_CONCURRENT_DOWNLOADS = 16
+RETRY_ATTEMPTS = 3
+
+# Files larger than this are split into parallel byte-range requests so a
+# single connection's congestion window no longer caps throughput
+RANGE_SPLIT_THRESHOLD = 8 * 1024 * 1024
+RANGE_PARTS = 4
+
+# 1 MiB chunks: ~128x fewer write syscalls and loop iterations than the
+# 8 KiB default, which matters once many downloads share the event loop
+CHUNK_SIZE = 1024 * 1024
+
+headers = {
+    "Authorization": f"Bearer {API_TOKEN}"
+}
+
+logger = logging.getLogger(__name__)
+
+# Characters that are invalid in filenames on at least one supported OS
+_UNSAFE_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+
+def safe_name(file_name):
+    """Sanitize a server-supplied display name into a safe local filename"""
+    return _UNSAFE_CHARS.sub("_", file_name).strip(". ") or "unnamed"
+
+# On-disk cache of listing responses keyed by URL. Conditional GETs against
+# it let Canvas answer 304 (no body) for anything unchanged between runs.
+METADATA_CACHE_PATH = "metadata_cache.json"
+
+
+def load_metadata_cache():
+    """Load the listing cache from disk, tolerating a missing/corrupt file"""
+    try:
+        with open(METADATA_CACHE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_metadata_cache(cache):
+    """Persist the listing cache for the next run"""
+    try:
+        with open(METADATA_CACHE_PATH, "w") as f:
+            json.dump(cache, f)
+    except OSError as e:
+        logger.warning("Could not save metadata cache: %s", e)
+
+
+async def fetch_paginated(session, url, cache=None):
+    """Fetch every page of a Canvas collection endpoint.
+
+    Canvas defaults to ~10 items per page and advertises the next page in an
+    RFC 5988 Link header; following it with per_page=100 keeps the round-trip
+    count ~10x lower than the default page size. When a cache dict is given,
+    each page is requested conditionally (If-None-Match/If-Modified-Since)
+    and a 304 reuses the cached body without transferring it again.
+    """
+    results = []
+    while url:
+        conditional = {}
+        cached = cache.get(url) if cache is not None else None
+        if cached:
+            if cached.get("etag"):
+                conditional["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                conditional["If-Modified-Since"] = cached["last_modified"]
+
+        response = await session.get(url, headers=conditional)
+        if response.status_code == 304 and cached:
+            results.extend(cached["body"])
+            url = cached.get("next")
+            continue
+        response.raise_for_status()
+        body = _json_loads(response.content)
+        next_url = response.links.get("next", {}).get("url")
+        if cache is not None:
+            cache[url] = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "body": body,
+                "next": next_url,
+            }
+        results.extend(body)
+        url = next_url
+    return results
+
+
+async def fetch_courses(session, cache=None):
+    """Fetch the list of courses for the current user"""
+    data = await fetch_paginated(session, f"{BASE_URL}/courses?per_page=100", cache)
+    # Full dump only when debug logging is on; formatting it is not free
+    logger.debug("Courses JSON Response: %s", data)
+    return data
+
+
+async def fetch_files(session, course_id, cache=None):
+    """Fetch the list of files for a single course"""
+    url = f"{BASE_URL}/courses/{course_id}/files?per_page=100"
+    try:
+        return await fetch_paginated(session, url, cache)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 403:
+            # Files tab is disabled or restricted for this course
+            logger.warning("Access denied to files for course %s", course_id)
+            return []
+        raise
+
+
+class _RangeUnsupported(Exception):
+    """Raised when the server answers a Range request with 200 instead of 206"""
+
+
+async def _download_ranged(session, file_url, file_path, size):
+    """Fetch a large file as RANGE_PARTS parallel byte-range requests.
+
+    The destination is preallocated with ftruncate and each part writes its
+    slice in place with os.pwrite, so the parts need no coordination.
+    """
+    part_size = -(-size // RANGE_PARTS)
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    # All pwrites go through this private executor so the teardown below
+    # can prove no write is still in flight before the fd closes
+    writer = ThreadPoolExecutor(max_workers=RANGE_PARTS)
+    try:
+        os.ftruncate(fd, size)
+        loop = asyncio.get_running_loop()
+
+        async def fetch_part(start, end):
+            range_headers = {"Range": f"bytes={start}-{end}"}
+            async with session.stream("GET", file_url, headers=range_headers) as response:
+                if response.status_code == 200:
+                    raise _RangeUnsupported(file_url)
+                response.raise_for_status()
+                offset = start
+                async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                    await loop.run_in_executor(writer, os.pwrite, fd, chunk, offset)
+                    offset += len(chunk)
+
+        tasks = [asyncio.create_task(
+                     fetch_part(i * part_size, min((i + 1) * part_size, size) - 1))
+                 for i in range(RANGE_PARTS)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # One failing part (including the designed _RangeUnsupported
+            # fallback) must not leave its siblings writing through fd
+            # after the close below: cancel them, wait for the tasks to
+            # unwind, then drain the writer - cancelling a task abandons
+            # any pwrite already running on its executor thread, and a
+            # stale write racing a reused fd number would corrupt the
+            # restarted download
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.to_thread(writer.shutdown, True)
+    finally:
+        os.close(fd)
+
+
+async def download_file(session, semaphore, file_url, file_name):
+    """Download a single file into DOWNLOAD_FOLDER.
+
+    Bytes are written to a .part file and moved into place with os.replace
+    only after the download completes, so a crash mid-transfer never leaves
+    a truncated file that a later skip check would trust.
+    """
+    file_path = os.path.join(DOWNLOAD_FOLDER, safe_name(file_name))
+    part_path = file_path + ".part"
+
+    async with semaphore:
+        # Probe the size first: big files go down the parallel-range path
+        try:
+            probe = await session.head(file_url)
+            size = int(probe.headers.get("Content-Length", 0))
+            ranged = probe.headers.get("Accept-Ranges") == "bytes"
+        except httpx.HTTPError:
+            size, ranged = 0, False
+
+        if ranged and size > RANGE_SPLIT_THRESHOLD:
+            try:
+                await _download_ranged(session, file_url, part_path, size)
+                os.replace(part_path, file_path)
+                logger.debug("Downloaded: %s", file_name)
+                return
+            except _RangeUnsupported:
+                pass  # server ignored the Range header; stream it instead
+
+        for attempt in range(RETRY_ATTEMPTS):
+            # Resume a leftover partial transfer instead of starting over
+            resume_from = 0
+            request_headers = {}
+            try:
+                resume_from = os.path.getsize(part_path)
+            except OSError:
+                pass
+            if resume_from:
+                request_headers["Range"] = f"bytes={resume_from}-"
+
+            async with session.stream("GET", file_url, headers=request_headers) as response:
+                if response.status_code in (429, 503):
+                    # Back off for as long as the server asks before retrying
+                    retry_after = float(response.headers.get("Retry-After", 2 ** attempt))
+                    logger.info("Throttled (%s) on %s, retrying in %ss...",
+                                response.status_code, file_name, retry_after)
+                    await asyncio.sleep(retry_after)
+                    continue
+                response.raise_for_status()
+                # 206 means the server honored the Range; otherwise restart
+                mode = "ab" if resume_from and response.status_code == 206 else "wb"
+                with open(part_path, mode) as f:
+                    async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                        # Offload the blocking write so the event loop keeps serving
+                        # other in-flight downloads while the disk catches up
+                        await asyncio.to_thread(f.write, chunk)
+                os.replace(part_path, file_path)
+                break
+        else:
+            raise RuntimeError(f"Gave up on {file_name} after {RETRY_ATTEMPTS} throttled attempts")
+
+    logger.debug("Downloaded: %s", file_name)
+
+
+async def main():
+    """Fetch all courses, then fetch and download their files concurrently"""
+    os.makedirs(DOWNLOAD_FOLDER, exist_ok=True)
+
+    limits = httpx.Limits(max_connections=MAX_CONCURRENT_DOWNLOADS,
+                          max_keepalive_connections=MAX_CONCURRENT_DOWNLOADS)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+
+    cache = load_metadata_cache()
+
+    # One shared HTTP/2 client for the whole run: requests multiplex over a
+    # pooled connection, so the TLS handshake is paid once and listing GETs
+    # are no longer head-of-line-blocked per connection
+    async with httpx.AsyncClient(http2=True, limits=limits, headers=headers,
+                                 timeout=30.0, follow_redirects=True) as session:
+        courses = await fetch_courses(session, cache)
+
+        # Prune unusable entries up front so task construction stays branch-free
+        eligible = [c for c in courses
+                    if c.get("id") and not c.get("access_restricted_by_date")]
+        if len(eligible) < len(courses):
+            logger.info("Skipping %d of %d courses (missing id or date-restricted)",
+                        len(courses) - len(eligible), len(courses))
+        course_ids = [c["id"] for c in eligible]
+
+        # Producer/consumer pipeline: downloads for a course start the moment
+        # its listing arrives, while other listings are still in flight
+        file_q = asyncio.Queue(maxsize=256)
+        failure_count = 0
+
+        async def produce(course_id):
+            files = await fetch_files(session, course_id, cache)
+            for file in files:
+                file_path = os.path.join(DOWNLOAD_FOLDER, safe_name(file["display_name"]))
+                if (os.path.exists(file_path)
+                        and file.get("size") is not None
+                        and os.path.getsize(file_path) == file["size"]):
+                    continue  # already fully downloaded on a previous run
+                await file_q.put((file["url"], file["display_name"]))
+
+        async def consume():
+            nonlocal failure_count
+            while True:
+                file_url, file_name = await file_q.get()
+                try:
+                    await download_file(session, semaphore, file_url, file_name)
+                except Exception as e:
+                    failure_count += 1
+                    logger.error("Failed to download %s: %s", file_name, e)
+                finally:
+                    file_q.task_done()
+
+        consumers = [asyncio.create_task(consume())
+                     for _ in range(MAX_CONCURRENT_DOWNLOADS)]
+
+        producer_results = await asyncio.gather(
+            *(produce(course_id) for course_id in course_ids),
+            return_exceptions=True
+        )
+        for course_id, result in zip(course_ids, producer_results):
+            if isinstance(result, Exception):
+                logger.error("Failed to list files for course %s: %s", course_id, result)
+        save_metadata_cache(cache)
+
+        # All producers are done; wait for the queue to drain then stop workers
+        await file_q.join()
+        for consumer in consumers:
+            consumer.cancel()
+
+        if failure_count:
+            logger.error("%d downloads failed", failure_count)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if not API_TOKEN:
+        raise SystemExit("Set the CANVAS_TOKEN environment variable to a Canvas API token "
+                         "(Account -> Settings -> New Access Token)")
+    asyncio.run(main())
@@ -1,14 +1,25 @@
 import os
+import sys
 import time
+import json
 import requests
 import hashlib
 import argparse
 import getpass
 import logging
-import traceback
+import logging.handlers
 import datetime
-import math
+import re
+import shutil
+import asyncio
+import threading
+import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from tqdm import tqdm
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
@@ -16,23 +27,180 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException
-from urllib.parse import urlparse, unquote
+from selenium.common.exceptions import (
+    TimeoutException,
+    NoSuchElementException,
+    ElementClickInterceptedException,
+    StaleElementReferenceException,
+    WebDriverException,
+)
+from urllib.parse import urlparse, urlsplit, unquote, urljoin
+
+from bs4 import BeautifulSoup
+
+try:
+    # lxml parses large link-heavy pages several times faster than the
+    # pure-Python html.parser; fall back gracefully when it is missing
+    import lxml  # noqa: F401
+    _BS_PARSER = "lxml"
+except ImportError:
+    _BS_PARSER = "html.parser"
+
+try:
+    # Advertise brotli only when the decoder is importable; Canvas serves
+    # br-encoded HTML/JSON ~30% smaller than gzip
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = "br, gzip, deflate"
+except ImportError:
+    _ACCEPT_ENCODING = "gzip, deflate"
 
-# Set up logging
+try:
+    # Used for the concurrent download pool; without them downloads still
+    # work, just sequentially over the requests session
+    import aiohttp
+    import aiofiles
+except ImportError:
+    aiohttp = None
+
+# Cap on concurrent downloads per course. Downloads are pure network I/O,
+# so overlapping them hides per-file round-trip latency; more than this
+# buys little on one origin and risks Canvas throttling.
+MAX_CONCURRENT_DOWNLOADS = 16
+
+# Set up logging. File records are buffered in memory and flushed in
+# batches (or immediately on ERROR) so the scraper doesn't pay a
+# synchronous file flush for every single info line during scraping.
 log_filename = f"canvas_scraper_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+_buffered_file_handler = logging.handlers.MemoryHandler(
+    capacity=512,
+    flushLevel=logging.ERROR,
+    target=logging.FileHandler(log_filename)
+)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler(log_filename),
+        _buffered_file_handler,
         logging.StreamHandler()
     ]
 )
 logger = logging.getLogger("CanvasScraper")
 
+# Remember where webdriver_manager put ChromeDriver so later runs skip its
+# version check (a network round trip) and ZIP extraction entirely
+_DRIVER_PATH_CACHE = os.path.expanduser("~/.canvas_scraper/chromedriver_path")
+
+# Matches the numeric course ID in any /courses/<id>... URL
+_COURSE_ID_RE = re.compile(r"/courses/(\d+)(?:/|$)")
+_FILE_ID_RE = re.compile(r"/files/(\d+)")
+
+# Extensions that mark a URL as a downloadable file; a tuple so endswith
+# checks them all in one C-level call
+_FILE_EXTS = ('.pdf', '.doc', '.docx', '.ppt', '.pptx', '.xls', '.xlsx', '.txt', '.zip',
+              '.jpg', '.jpeg', '.png', '.gif', '.mp3', '.mp4', '.mov', '.avi')
+
+# Extensions a derived filename may keep; anything else gets .pdf appended
+_DOC_EXTS = ('.pdf', '.doc', '.docx', '.ppt', '.pptx', '.xls', '.xlsx', '.txt', '.zip')
+
+
+# Characters that are invalid in filenames on at least one supported OS,
+# plus control characters; compiled once rather than scanned per call
+# One translate pass over a precomputed table replaces the characters
+# that are invalid on at least one supported OS (plus control chars)
+# without the regex machinery or intermediate strings
+_BAD_CHARS_TABLE = str.maketrans(
+    {c: '_' for c in '<>:"/\\|?*' + ''.join(map(chr, range(0x20)))})
+_MULTI_SPACE = re.compile(r'\s+')
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
+@lru_cache(maxsize=4096)
+def _sanitize_filename_impl(filename):
+    """Sanitize a filename to be safe for all operating systems.
+    
+    Module-level and cached: the same course/module/file names come through
+    here dozens of times (paths, screenshots, log lines) per course.
+    """
+    # Replace invalid/control characters and collapse whitespace runs
+    filename = _MULTI_SPACE.sub(' ', filename.translate(_BAD_CHARS_TABLE))
+    
+    # Trim leading/trailing spaces and periods, and keep paths comfortably
+    # under the common 255-byte component limit
+    filename = filename.strip('. ')[:240]
+    
+    # Ensure the filename is not empty
+    if not filename:
+        filename = "unnamed"
+        
+    return filename
+
+
+@lru_cache(maxsize=4096)
+def _is_downloadable_link_impl(url):
+    """Check if a URL is likely to be a downloadable file.
+    
+    Cached because the same hrefs (nav links, repeated file links) are
+    tested on every page they appear on.
+    """
+    if not url:
+        return False
+        
+    # Check for Canvas file download patterns
+    if "/files/" in url and ("/download" in url or "?download=1" in url or "?download_frd=1" in url):
+        return True
+        
+    # Check for common file extensions, ignoring any query string
+    return url.lower().split("?", 1)[0].endswith(_FILE_EXTS)
+
+# Locators that differ between the supported identity providers; the shared
+# username -> password -> confirm logic lives in _login_flow so fixes and
+# wait tuning only have to happen in one place
+AUTH_FLOWS = {
+    "microsoft": {
+        "user": (By.ID, "i0116"),
+        "user_next": (By.ID, "idSIButton9"),
+        "password": (By.NAME, "passwd"),
+        "confirm": (By.ID, "idSIButton9"),   # "Stay signed in?" prompt
+        "confirm_twice": True,
+    },
+    "google": {
+        "user": (By.ID, "identifierId"),
+        "user_next": (By.CSS_SELECTOR, "#identifierNext button"),
+        "password": (By.NAME, "password"),
+        "password_next": (By.CSS_SELECTOR, "#passwordNext button"),
+        "verification_check": True,
+    },
+    "canvas": {
+        "user": (By.ID, "pseudonym_session_unique_id"),
+        "password": (By.ID, "pseudonym_session_password"),
+        "submit": (By.CSS_SELECTOR, "button[type='submit']"),
+        "confirm_texts": ["Yes", "Continue", "Accept", "Allow"],
+    },
+}
+
+def _get_chromedriver_path():
+    """Resolve the ChromeDriver binary, reusing the cached path when possible"""
+    try:
+        with open(_DRIVER_PATH_CACHE) as f:
+            cached_path = f.read().strip()
+        if cached_path and os.access(cached_path, os.X_OK):
+            logger.info(f"Using cached ChromeDriver at {cached_path}")
+            return cached_path
+    except OSError:
+        pass
+
+    driver_path = ChromeDriverManager().install()
+    try:
+        os.makedirs(os.path.dirname(_DRIVER_PATH_CACHE), exist_ok=True)
+        with open(_DRIVER_PATH_CACHE, "w") as f:
+            f.write(driver_path)
+    except OSError as e:
+        logger.warning(f"Could not cache ChromeDriver path: {e}")
+    return driver_path
+
 class CanvasScraper:
-    def __init__(self, canvas_url, username, password, download_dir="Canvas_Downloads", skip_existing=True, headless=False, delay=2):
+    def __init__(self, canvas_url, username, password, download_dir="Canvas_Downloads", skip_existing=True, headless=False, delay=2, debug_visibility=False, grid_url=None, workers=1, wait_timeout=8, wait_alt_timeout=2):
         """
         Initialize the Canvas Scraper
         
@@ -44,6 +212,11 @@ class CanvasScraper:
             skip_existing (bool): Skip downloading files that already exist
             headless (bool): Run Chrome in headless mode (no visible browser)
             delay (int): Delay in seconds between actions for visibility
+            debug_visibility (bool): Pause between actions so a human can follow along
+            grid_url (str): Selenium Grid hub URL; enables parallel course scraping
+            workers (int): Number of courses to scrape in parallel on the Grid
+            wait_timeout (int): Seconds to wait for primary page elements
+            wait_alt_timeout (int): Seconds to wait for fallback selectors
         """
         self.canvas_url = canvas_url.rstrip('/')  # Remove trailing slash if present
         self.username = username
@@ -52,12 +225,204 @@ class CanvasScraper:
         self.skip_existing = skip_existing
         self.headless = headless
         self.delay = delay
+        self.debug_visibility = debug_visibility
+        self.grid_url = grid_url
+        self.workers = workers if grid_url else 1
+        self.wait_timeout = wait_timeout
+        self.wait_alt_timeout = wait_alt_timeout
+        # Per-thread state: when courses are scraped in parallel, each worker
+        # thread gets its own browser and its own download queue
+        self._local = threading.local()
+        self._driver_pool = None
+        # Screenshots are debugging aids; each one costs a synchronous
+        # full-page PNG encode, so they are off unless CANVAS_DEBUG is set
+        self.debug_screenshots = (bool(os.environ.get("CANVAS_DEBUG"))
+                                  or logger.isEnabledFor(logging.DEBUG))
+        self._screenshot_pool = ThreadPoolExecutor(max_workers=1) if self.debug_screenshots else None
+        self._screenshot_dir_ready = False
         self.driver = None
-        self.session = requests.Session()
+        # requests.Session is not thread-safe, so every thread builds its
+        # own pooled session on first use; they all share this one locked
+        # cookie jar, so cookies exported after login cover every thread
+        self._cookie_jar = requests.cookies.RequestsCookieJar()
+        # Content pages already scraped (keyed by fragment-stripped URL) map
+        # to the download specs found there, so cross-linked pages are only
+        # visited once per run - and, via visited_cache.json, across runs
+        self._visited_urls = {}
+        # What each completed download looked like on the wire (ETag and
+        # size), persisted as .etags.json so later runs can trust or
+        # re-fetch existing files without guessing
+        self._etags = {}
+        # Downloads that failed this run, reported as failures.json; the
+        # files simply stay absent so the next run retries them
+        self._failures = []
         self.auth_provider = self._detect_auth_provider()
+        # Pre-warm a keep-alive connection to the Canvas host while Chrome
+        # is still starting up, so the first real session request finds a
+        # socket with TCP+TLS already done. The warm-up targets the main
+        # thread's session explicitly - pools live per session, and this
+        # runs before the main thread issues any requests of its own.
+        threading.Thread(target=self._prewarm_connection,
+                         args=(self.session,), daemon=True).start()
         logger.info(f"Initializing Canvas Scraper for {canvas_url}")
         logger.info(f"Authentication provider detected: {self.auth_provider}")
         
+    def _build_session(self):
+        """Build the pooled keep-alive session backing the session property.
+        
+        Tuned for this workload: many downloads hit the same Canvas host,
+        so connection reuse (instead of fresh TLS handshakes) and automatic
+        retries on transient/throttling status codes matter a lot here.
+        """
+        session = requests.Session()
+        retry = Retry(total=5, backoff_factor=0.3,
+                      status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=frozenset(["GET", "HEAD"]))
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({
+            "User-Agent": "CanvasScraper/1.0",
+            "Connection": "keep-alive",
+            "Accept-Encoding": _ACCEPT_ENCODING
+        })
+        session.cookies = self._cookie_jar
+        return session
+        
+    @property
+    def session(self):
+        """The HTTP session owned by the current thread"""
+        if not hasattr(self._local, "session"):
+            self._local.session = self._build_session()
+        return self._local.session
+        
+    @property
+    def driver(self):
+        """The WebDriver owned by the current thread (main driver by default)"""
+        return getattr(self._local, "driver", None)
+        
+    @driver.setter
+    def driver(self, value):
+        self._local.driver = value
+        
+    @property
+    def _pending_downloads(self):
+        # Files discovered while walking a course are queued here and
+        # downloaded concurrently once the Selenium walk is done
+        if not hasattr(self._local, "pending_downloads"):
+            self._local.pending_downloads = []
+        return self._local.pending_downloads
+        
+    @_pending_downloads.setter
+    def _pending_downloads(self, value):
+        self._local.pending_downloads = value
+        
+    @property
+    def _queued_paths(self):
+        if not hasattr(self._local, "queued_paths"):
+            self._local.queued_paths = set()
+        return self._local.queued_paths
+        
+    @property
+    def _known_files(self):
+        # Paths of non-empty files already on disk for the current course,
+        # indexed once per course so skip checks don't stat per candidate
+        if not hasattr(self._local, "known_files"):
+            self._local.known_files = set()
+        return self._local.known_files
+        
+    @_known_files.setter
+    def _known_files(self, value):
+        self._local.known_files = value
+        
+    def _visited_cache_path(self):
+        return os.path.join(self.base_download_dir, "visited_cache.json")
+        
+    def _load_visited_cache(self):
+        """Load the content-page visit cache persisted by a previous run"""
+        try:
+            with open(self._visited_cache_path()) as f:
+                self._visited_urls = json.load(f)
+            logger.info(f"Loaded {len(self._visited_urls)} cached content pages")
+        except (OSError, ValueError):
+            self._visited_urls = {}
+            
+    def _save_visited_cache(self):
+        """Persist the content-page visit cache for the next run"""
+        try:
+            with open(self._visited_cache_path(), "w") as f:
+                json.dump(self._visited_urls, f)
+        except OSError as e:
+            logger.warning(f"Could not save visited-page cache: {str(e)}")
+            
+    def _etag_cache_path(self):
+        return os.path.join(self.base_download_dir, ".etags.json")
+        
+    def _load_etag_cache(self):
+        """Load the per-file ETag/size records persisted by a previous run"""
+        try:
+            with open(self._etag_cache_path()) as f:
+                self._etags = json.load(f)
+        except (OSError, ValueError):
+            self._etags = {}
+            
+    def _save_etag_cache(self):
+        """Persist the per-file ETag/size records for the next run"""
+        try:
+            with open(self._etag_cache_path(), "w") as f:
+                json.dump(self._etags, f)
+        except OSError as e:
+            logger.warning(f"Could not save etag cache: {str(e)}")
+            
+    def _record_download(self, file_path, etag, size):
+        """Remember what a completed download looked like on the wire"""
+        self._etags[file_path] = {"etag": etag, "size": size}
+        
+    def _verify_existing(self, file_url, file_path, local_size, direct):
+        """Decide whether an existing local file can be trusted.
+        
+        A size recorded at download time settles it without touching the
+        network; otherwise one HEAD against a direct URL compares
+        Content-Length so a truncated earlier download gets re-fetched.
+        Preview URLs answer with HTML, so they are trusted as-is.
+        """
+        record = self._etags.get(file_path)
+        if record and record.get("size"):
+            return record["size"] == local_size
+        if not direct:
+            return True
+        try:
+            head = self.session.head(file_url, allow_redirects=True, timeout=15)
+            remote_size = int(head.headers.get("Content-Length", 0))
+            if head.ok and remote_size:
+                if remote_size != local_size:
+                    logger.info(f"Size mismatch for {os.path.basename(file_path)} "
+                                f"({local_size} != {remote_size}), re-downloading")
+                    return False
+                self._record_download(file_path, head.headers.get("ETag"), remote_size)
+        except (requests.RequestException, ValueError):
+            pass
+        return True
+            
+    def _block_asset_requests(self, driver):
+        """Block image/font/tracker requests on a driver via CDP (best effort)"""
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": [
+                "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg",
+                "*.woff*", "*.ttf", "*.mp4",
+                "*google-analytics*", "*doubleclick*", "*pendo*", "*inspectlet*"
+            ]})
+        except Exception as e:
+            logger.warning(f"Could not enable CDP request blocking: {str(e)}")
+            
+    def _prewarm_connection(self, session):
+        """Complete the TLS handshake to the Canvas host in the background"""
+        try:
+            session.head(self.canvas_url, allow_redirects=True, timeout=10)
+        except requests.RequestException:
+            pass  # purely an optimization; real requests will report errors
+        
     def _detect_auth_provider(self):
         """Try to detect the authentication provider based on the Canvas URL"""
         if "ycp.instructure.com" in self.canvas_url:
@@ -72,10 +437,30 @@ class CanvasScraper:
         logger.info("Initializing Chrome browser...")
         try:
             # Use webdriver_manager to automatically download the correct ChromeDriver
-            service = Service(ChromeDriverManager().install())
+            service = Service(_get_chromedriver_path())
             
             # Configure Chrome options
             chrome_options = webdriver.ChromeOptions()
+            
+            # Reuse a persistent profile so cookies/SSO tokens survive between
+            # runs; with a live session the auth flow can be skipped entirely
+            profile_dir = os.path.expanduser("~/.canvas_scraper/chrome_profile")
+            os.makedirs(profile_dir, exist_ok=True)
+            chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+            chrome_options.add_argument("--profile-directory=Default")
+            
+            # Return from driver.get() on DOMContentLoaded instead of waiting
+            # for every image/font/analytics request to finish; all scraping
+            # here only needs the DOM. Visibility debugging opts back into
+            # full rendering so a human watching the browser sees real pages.
+            chrome_options.page_load_strategy = "eager"
+            if not self.debug_visibility:
+                chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+                chrome_options.add_experimental_option("prefs", {
+                    "profile.managed_default_content_settings.images": 2,
+                    "profile.default_content_setting_values.notifications": 2,
+                })
+            
             if self.headless:
                 logger.info("Running in headless mode...")
                 chrome_options.add_argument("--headless")
@@ -87,16 +472,39 @@ class CanvasScraper:
             # Initialize the Chrome driver
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
             
+            # Make find_elements return immediately when nothing matches;
+            # every wait in this class is already explicit
+            self.driver.implicitly_wait(0)
+            
+            # Block asset and tracker requests at the network layer; the
+            # scraper only reads the DOM, so images/fonts/analytics are
+            # pure page-load latency and egress
+            if not self.debug_visibility:
+                self._block_asset_requests(self.driver)
+            
             if not self.headless:
                 self.driver.maximize_window()
         
             logger.info(f"Navigating to {self.canvas_url}...")
             self.driver.get(self.canvas_url)
-            time.sleep(self.delay)  # Add delay for visibility
+            self._pause()
             
             # Take a screenshot of the login page
             self._take_screenshot("login_page")
             
+            # If the persistent profile still holds a valid session we land
+            # straight on the dashboard and can skip the whole auth flow
+            try:
+                WebDriverWait(self.driver, 5).until(
+                    EC.presence_of_element_located((By.CLASS_NAME, "ic-Dashboard-header"))
+                )
+                logger.info("Existing session is still valid, skipping login flow")
+                self._take_screenshot("dashboard")
+                self._export_cookies_to_session()
+                return True
+            except TimeoutException:
+                logger.info("No existing session, proceeding with login...")
+            
             # Detect login method if unknown
             if self.auth_provider == "unknown":
                 self.auth_provider = self._detect_login_method()
@@ -104,12 +512,8 @@ class CanvasScraper:
             logger.info(f"Detected authentication provider: {self.auth_provider}")
             
             # Handle login based on the authentication provider
-            if self.auth_provider == "microsoft":
-                self._login_microsoft()
-            elif self.auth_provider == "google":
-                self._login_google()
-            elif self.auth_provider == "canvas":
-                self._login_canvas_native()
+            if self.auth_provider in AUTH_FLOWS:
+                self._login_flow(self.auth_provider)
             else:
                 logger.info("Unknown authentication provider. Attempting generic login...")
                 self._login_generic()
@@ -125,14 +529,13 @@ class CanvasScraper:
             self._take_screenshot("dashboard")
             
             # Transfer cookies from Selenium to Requests session
-            for cookie in self.driver.get_cookies():
-                self.session.cookies.set(cookie['name'], cookie['value'])
+            self._export_cookies_to_session()
                 
             return True
             
         except Exception as e:
             logger.error(f"Login failed: {str(e)}")
-            logger.error(traceback.format_exc())
+            logger.error("Traceback:", exc_info=True)
             
             # Take a screenshot of the error page
             self._take_screenshot("login_error")
@@ -144,6 +547,35 @@ class CanvasScraper:
             logger.info("If you're having trouble logging in, try manually logging in to Canvas in a browser first.")
             return False
             
+    def _export_cookies_to_session(self):
+        """Copy the browser's cookies into the requests session"""
+        for cookie in self.driver.get_cookies():
+            self.session.cookies.set(cookie['name'], cookie['value'])
+            
+    def release_browser(self):
+        """Close Chrome once the requests session alone can reach Canvas.
+        
+        The browser process holds hundreds of MB for the life of the scrape;
+        after login it is only needed as a scraping fallback, so callers that
+        work purely over HTTP can drop it early. The browser is kept if a
+        quick API probe through the session fails.
+        """
+        if not self.driver:
+            return True
+        try:
+            probe = self.session.get(f"{self.canvas_url}/api/v1/users/self", timeout=15)
+            if not probe.ok:
+                logger.info(f"API probe returned {probe.status_code}, keeping browser open")
+                return False
+        except requests.RequestException as e:
+            logger.info(f"API probe failed ({str(e)}), keeping browser open")
+            return False
+            
+        logger.info("API access confirmed, closing browser to free resources...")
+        self.driver.quit()
+        self.driver = None
+        return True
+        
     def _detect_login_method(self):
         """Detect the login method based on the login page elements"""
         try:
@@ -160,230 +592,191 @@ class CanvasScraper:
                 return "canvas"
                 
             return "unknown"
-        except:
+        except WebDriverException:
             return "unknown"
             
+    def _wait_for(self, locator, timeout=15):
+        """Wait until an element is present on the page and return it"""
+        return WebDriverWait(self.driver, timeout).until(
+            EC.presence_of_element_located(locator)
+        )
+
+    def _pause(self):
+        """Pause between actions, but only when visibility debugging is on.
+
+        The script used to sleep unconditionally between every action; the
+        explicit waits on the elements we actually need make those sleeps
+        redundant outside of watch-the-browser debugging sessions.
+        """
+        if self.debug_visibility:
+            time.sleep(self.delay)
+
     def _take_screenshot(self, name):
-        """Take a screenshot for debugging purposes"""
-        if self.driver:
-            try:
-                screenshot_dir = "screenshots"
-                os.makedirs(screenshot_dir, exist_ok=True)
-                timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"{screenshot_dir}/{name}_{timestamp}.png"
-                self.driver.save_screenshot(filename)
-                logger.info(f"Screenshot saved to {filename}")
-            except Exception as e:
-                logger.error(f"Failed to take screenshot: {str(e)}")
-    
-    def _login_microsoft(self):
-        """Login using Microsoft authentication"""
-        logger.info("Logging in with Microsoft authentication...")
+        """Take a screenshot for debugging purposes.
         
+        No-op unless CANVAS_DEBUG is set or debug logging is enabled. When enabled, the PNG is captured
+        on this thread (the WebDriver connection is not thread-safe) and the
+        disk write is handed to a background worker so the scrape continues
+        while the file lands.
+        """
+        if not self.debug_screenshots or not self.driver:
+            return
         try:
-            # Wait for the email input field
-            logger.info("Waiting for email input field...")
-            email_input = WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.ID, "i0116"))
-            )
-            logger.info("Entering email...")
-            email_input.clear()
-            email_input.send_keys(self.username)
-            time.sleep(self.delay)  # Add delay for visibility
-            
-            logger.info("Clicking next button...")
-            next_button = WebDriverWait(self.driver, 15).until(
-                EC.element_to_be_clickable((By.ID, "idSIButton9"))
-            )
-            next_button.click()
-            time.sleep(self.delay)  # Add delay for visibility
-            
-            # Take a screenshot after entering email
-            self._take_screenshot("after_email")
-            
-            # Wait for the password input field
-            logger.info("Waiting for password input field...")
-            password_input = WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.NAME, "passwd"))
-            )
-            logger.info("Entering password...")
-            password_input.clear()
-            password_input.send_keys(self.password)
-            time.sleep(self.delay)  # Add delay for visibility
-            password_input.send_keys(Keys.RETURN)
-            time.sleep(self.delay)  # Add delay for visibility
-            
-            # Take a screenshot after entering password
-            self._take_screenshot("after_password")
-            
-            # Handle "Stay signed in?" prompt - Always click "Yes"
-            try:
-                logger.info("Looking for 'Stay signed in' prompt...")
-                # Take a screenshot before clicking stay signed in
-                self._take_screenshot("before_stay_signed_in")
-                
-                sign_in_button = WebDriverWait(self.driver, 15).until(
-                    EC.element_to_be_clickable((By.ID, "idSIButton9"))
-                )
-                logger.info("Clicking 'Yes' on 'Stay signed in' prompt...")
-                sign_in_button.click()
-                time.sleep(self.delay)  # Add delay for visibility
-            except TimeoutException:
-                logger.info("No 'Stay signed in' prompt detected, continuing...")
-            
-            # Handle additional confirmation if needed
-            try:
-                logger.info("Looking for additional confirmation prompt...")
-                # Take a screenshot before additional confirmation
-                self._take_screenshot("before_additional_confirmation")
-                
-                confirm_button = WebDriverWait(self.driver, 15).until(
-                    EC.element_to_be_clickable((By.ID, "idSIButton9"))
-                )
-                logger.info("Clicking confirmation button...")
-                confirm_button.click()
-                time.sleep(self.delay)  # Add delay for visibility
-            except TimeoutException:
-                logger.info("No additional confirmation prompt detected, continuing...")
-                
+            if not self._screenshot_dir_ready:
+                os.makedirs("screenshots", exist_ok=True)
+                self._screenshot_dir_ready = True
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            thread = threading.current_thread()
+            suffix = "" if thread is threading.main_thread() else f"_{thread.name}"
+            filename = f"screenshots/{name}{suffix}_{timestamp}.png"
+            png_bytes = self.driver.get_screenshot_as_png()
+            self._screenshot_pool.submit(self._write_screenshot, filename, png_bytes)
         except Exception as e:
-            logger.error(f"Microsoft login failed: {str(e)}")
-            logger.error(traceback.format_exc())
-            self._take_screenshot("microsoft_login_error")
-            raise
+            logger.error(f"Failed to take screenshot: {str(e)}")
             
-    def _login_google(self):
-        """Login using Google authentication"""
-        logger.info("Logging in with Google authentication...")
-        
+    def _write_screenshot(self, filename, png_bytes):
+        """Write captured screenshot bytes to disk (runs on the worker thread)"""
         try:
-            # Wait for the email input field
-            logger.info("Waiting for email input field...")
-            email_input = WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.ID, "identifierId"))
-            )
-            logger.info("Entering email...")
-            email_input.clear()
-            email_input.send_keys(self.username)
-            time.sleep(self.delay)  # Add delay for visibility
-            
-            # Take a screenshot after entering email
-            self._take_screenshot("google_after_email")
-            
-            # Click next button or press Enter
-            try:
-                next_button = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, "#identifierNext button"))
-                )
-                logger.info("Clicking next button...")
-                next_button.click()
-            except:
-                logger.info("No next button found, pressing Enter...")
-                email_input.send_keys(Keys.RETURN)
-                
-            time.sleep(self.delay)  # Add delay for visibility
-            
-            # Wait for the password input field
-            logger.info("Waiting for password input field...")
-            password_input = WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.NAME, "password"))
-            )
-            logger.info("Entering password...")
-            password_input.clear()
-            password_input.send_keys(self.password)
-            time.sleep(self.delay)  # Add delay for visibility
-            
-            # Take a screenshot after entering password
-            self._take_screenshot("google_after_password")
-            
-            # Click next button or press Enter
-            try:
-                password_next_button = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, "#passwordNext button"))
-                )
-                logger.info("Clicking password next button...")
-                password_next_button.click()
-            except:
-                logger.info("No password next button found, pressing Enter...")
-                password_input.send_keys(Keys.RETURN)
-                
-            time.sleep(self.delay)  # Add delay for visibility
-            
-            # Check for additional verification or prompts
-            try:
-                logger.info("Checking for additional verification steps...")
-                # Take a screenshot of any additional verification
-                self._take_screenshot("google_verification")
-                
-                # Look for common verification elements
-                verification_elements = self.driver.find_elements(By.CSS_SELECTOR, 
-                    "input[type='tel'], button:contains('Verify'), button:contains('Next'), button:contains('Continue')")
-                
-                if verification_elements:
-                    logger.info("Additional verification step detected. Manual intervention may be required.")
-                    # Give extra time for manual intervention if needed
-                    time.sleep(10)
-            except:
-                logger.info("No additional verification steps detected.")
-                
+            with open(filename, "wb") as f:
+                f.write(png_bytes)
+            logger.info(f"Screenshot saved to {filename}")
         except Exception as e:
-            logger.error(f"Google login failed: {str(e)}")
-            logger.error(traceback.format_exc())
-            self._take_screenshot("google_login_error")
-            raise
+            logger.error(f"Failed to write screenshot: {str(e)}")
+    
+    def _find_buttons_with_text(self, texts):
+        """Find buttons whose visible text contains any of the given strings.
+        
+        CSS :contains() is a jQuery extension that Selenium rejects, so the
+        old selectors never matched anything; a single XPath query with
+        or-joined contains() clauses does the same job in one DOM pass.
+        """
+        clauses = " or ".join(f"contains(normalize-space(.), '{text}')" for text in texts)
+        return self.driver.find_elements(By.XPATH, f"//button[{clauses}]")
         
-    def _login_canvas_native(self):
-        """Login using Canvas native authentication"""
-        logger.info("Logging in with Canvas native authentication...")
+    def _login_flow(self, provider):
+        """Drive a username -> password -> confirm login flow from AUTH_FLOWS.
+        
+        The provider-specific login methods were ~95% identical code; the
+        table holds the locators that differ and this single path holds the
+        logic, so every provider benefits from the same explicit waits.
+        """
+        flow = AUTH_FLOWS[provider]
+        logger.info(f"Logging in with {provider} authentication...")
         
         try:
-            # Wait for the email input field
-            logger.info("Waiting for email input field...")
-            email_input = WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.ID, "pseudonym_session_unique_id"))
-            )
-            logger.info("Entering email...")
-            email_input.clear()
-            email_input.send_keys(self.username)
-            time.sleep(self.delay)  # Add delay for visibility
+            # Enter the username
+            logger.info("Waiting for username input field...")
+            user_input = self._wait_for(flow["user"])
+            logger.info("Entering username...")
+            user_input.clear()
+            user_input.send_keys(self.username)
+            self._pause()
+            
+            if "user_next" in flow:
+                try:
+                    next_button = WebDriverWait(self.driver, 5).until(
+                        EC.element_to_be_clickable(flow["user_next"])
+                    )
+                    logger.info("Clicking next button...")
+                    next_button.click()
+                except TimeoutException:
+                    logger.info("No next button found, pressing Enter...")
+                    user_input.send_keys(Keys.RETURN)
+                
+                # Wait for the username page to actually transition instead of sleeping
+                try:
+                    WebDriverWait(self.driver, 15).until(EC.staleness_of(user_input))
+                except TimeoutException:
+                    logger.info("Username input did not go stale, continuing anyway...")
+                self._pause()
+            
+            self._take_screenshot(f"{provider}_after_username")
             
-            # Enter password
+            # Enter the password
+            logger.info("Waiting for password input field...")
+            password_input = self._wait_for(flow["password"])
             logger.info("Entering password...")
-            password_input = self.driver.find_element(By.ID, "pseudonym_session_password")
             password_input.clear()
             password_input.send_keys(self.password)
-            time.sleep(self.delay)  # Add delay for visibility
-            
-            # Take a screenshot before clicking login
-            self._take_screenshot("before_canvas_login")
+            self._pause()
             
-            # Click login button
-            logger.info("Clicking login button...")
-            login_button = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-            login_button.click()
-            time.sleep(self.delay)  # Add delay for visibility
+            # Submit it with whatever control this provider exposes
+            if "password_next" in flow:
+                try:
+                    password_next_button = WebDriverWait(self.driver, 5).until(
+                        EC.element_to_be_clickable(flow["password_next"])
+                    )
+                    logger.info("Clicking password next button...")
+                    password_next_button.click()
+                except TimeoutException:
+                    logger.info("No password next button found, pressing Enter...")
+                    password_input.send_keys(Keys.RETURN)
+            elif "submit" in flow:
+                logger.info("Clicking login button...")
+                self.driver.find_element(*flow["submit"]).click()
+            else:
+                password_input.send_keys(Keys.RETURN)
+            self._pause()
             
-            # Take a screenshot after login attempt
-            self._take_screenshot("after_canvas_login")
+            self._take_screenshot(f"{provider}_after_password")
             
-            # Check for "Stay signed in" or similar prompts
-            try:
-                logger.info("Looking for post-login confirmation prompts...")
-                # Look for common confirmation buttons
-                confirm_buttons = self.driver.find_elements(By.CSS_SELECTOR, 
-                    "button:contains('Yes'), button:contains('Continue'), button:contains('Accept'), button:contains('Allow')")
+            # Accept "Stay signed in?"-style prompts. By this point the
+            # prompt is either already on screen or we have navigated past
+            # it, so a short wait is enough
+            if "confirm" in flow:
+                try:
+                    logger.info("Looking for confirmation prompt...")
+                    confirm_button = WebDriverWait(self.driver, 5).until(
+                        EC.element_to_be_clickable(flow["confirm"])
+                    )
+                    logger.info("Clicking confirmation button...")
+                    confirm_button.click()
+                    self._pause()
+                except TimeoutException:
+                    logger.info("No confirmation prompt detected, continuing...")
                 
-                if confirm_buttons:
-                    logger.info(f"Found {len(confirm_buttons)} confirmation buttons, clicking the first one...")
-                    confirm_buttons[0].click()
-                    time.sleep(self.delay)  # Add delay for visibility
-            except Exception as e:
-                logger.info(f"No post-login confirmation prompts found or error: {str(e)}")
+                if flow.get("confirm_twice"):
+                    # A second prompt is rare; probe for it without blocking
+                    # instead of burning another full wait timeout
+                    extra_buttons = self.driver.find_elements(*flow["confirm"])
+                    if extra_buttons:
+                        logger.info("Clicking additional confirmation button...")
+                        extra_buttons[0].click()
+                        self._pause()
+            
+            if "confirm_texts" in flow:
+                try:
+                    logger.info("Looking for post-login confirmation prompts...")
+                    confirm_buttons = self._find_buttons_with_text(flow["confirm_texts"])
+                    if confirm_buttons:
+                        logger.info(f"Found {len(confirm_buttons)} confirmation buttons, clicking the first one...")
+                        confirm_buttons[0].click()
+                        self._pause()
+                except Exception as e:
+                    logger.info(f"No post-login confirmation prompts found or error: {str(e)}")
+            
+            # Some providers interpose a 2FA/verification step
+            if flow.get("verification_check"):
+                try:
+                    logger.info("Checking for additional verification steps...")
+                    self._take_screenshot(f"{provider}_verification")
+                    
+                    verification_elements = (
+                        self.driver.find_elements(By.CSS_SELECTOR, "input[type='tel']")
+                        + self._find_buttons_with_text(["Verify", "Next", "Continue"])
+                    )
+                    
+                    if verification_elements:
+                        logger.info("Additional verification step detected. Manual intervention may be required.")
+                        # Give extra time for manual intervention if needed
+                        time.sleep(10)
+                except Exception:
+                    logger.info("No additional verification steps detected.")
                 
         except Exception as e:
-            logger.error(f"Canvas native login failed: {str(e)}")
-            logger.error(traceback.format_exc())
-            self._take_screenshot("canvas_login_error")
+            logger.error(f"{provider} login failed: {str(e)}")
+            logger.error("Traceback:", exc_info=True)
+            self._take_screenshot(f"{provider}_login_error")
             raise
         
     def _login_generic(self):
@@ -401,10 +794,13 @@ class CanvasScraper:
                 logger.info("Found username field, entering username...")
                 username_fields[0].clear()
                 username_fields[0].send_keys(self.username)
-                time.sleep(self.delay)  # Add delay for visibility
+                self._pause()
                 
                 # Try to find a "Next" button first
-                next_buttons = self.driver.find_elements(By.CSS_SELECTOR, "button:contains('Next'), input[value='Next']")
+                next_buttons = (
+                    self._find_buttons_with_text(["Next"])
+                    + self.driver.find_elements(By.CSS_SELECTOR, "input[value='Next']")
+                )
                 if next_buttons:
                     logger.info("Found Next button, clicking...")
                     next_buttons[0].click()
@@ -412,7 +808,7 @@ class CanvasScraper:
                     logger.info("No Next button found, pressing Enter...")
                     username_fields[0].send_keys(Keys.RETURN)
                     
-                time.sleep(self.delay)  # Add delay for visibility
+                self._pause()
             
             # Take a screenshot after username
             self._take_screenshot("generic_after_username")
@@ -424,14 +820,16 @@ class CanvasScraper:
                 logger.info("Found password field, entering password...")
                 password_fields[0].clear()
                 password_fields[0].send_keys(self.password)
-                time.sleep(self.delay)  # Add delay for visibility
+                self._pause()
                 
                 # Take a screenshot after password
                 self._take_screenshot("generic_after_password")
                 
                 # Try to find a submit button first
-                submit_buttons = self.driver.find_elements(By.CSS_SELECTOR, 
-                    "button[type='submit'], input[type='submit'], button:contains('Log in'), button:contains('Sign in'), button:contains('Continue')")
+                submit_buttons = (
+                    self.driver.find_elements(By.CSS_SELECTOR, "button[type='submit'], input[type='submit']")
+                    + self._find_buttons_with_text(["Log in", "Sign in", "Continue"])
+                )
                 if submit_buttons:
                     logger.info("Found submit button, clicking...")
                     submit_buttons[0].click()
@@ -439,7 +837,7 @@ class CanvasScraper:
                     logger.info("No submit button found, pressing Enter...")
                     password_fields[0].send_keys(Keys.RETURN)
                     
-                time.sleep(self.delay)  # Add delay for visibility
+                self._pause()
                 
             # Take a screenshot after login attempt
             self._take_screenshot("generic_after_login")
@@ -448,101 +846,227 @@ class CanvasScraper:
             try:
                 logger.info("Looking for post-login confirmation prompts...")
                 # Look for common confirmation buttons
-                confirm_buttons = self.driver.find_elements(By.CSS_SELECTOR, 
-                    "button:contains('Yes'), button:contains('Continue'), button:contains('Accept'), button:contains('Allow')")
+                confirm_buttons = self._find_buttons_with_text(["Yes", "Continue", "Accept", "Allow"])
                 
                 if confirm_buttons:
                     logger.info(f"Found {len(confirm_buttons)} confirmation buttons, clicking the first one...")
                     confirm_buttons[0].click()
-                    time.sleep(self.delay)  # Add delay for visibility
+                    self._pause()
             except Exception as e:
                 logger.info(f"No post-login confirmation prompts found or error: {str(e)}")
                 
         except Exception as e:
             logger.error(f"Generic login failed: {str(e)}")
-            logger.error(traceback.format_exc())
+            logger.error("Traceback:", exc_info=True)
             self._take_screenshot("generic_login_error")
     
     def get_courses(self):
-        """Get all available courses"""
+        """Yield all available courses as they are discovered.
+        
+        A generator rather than a list so processing of the first course can
+        start while later pagination pages are still being fetched, and so
+        memory stays flat however many enrollments an account has.
+        """
         logger.info("Fetching available courses...")
+        
+        # The REST API streams courses page by page; the Selenium
+        # DOM-scraping strategies stay around as a fallback for instances
+        # where the API is unreachable with session cookies
+        yielded = False
+        try:
+            for course in self._get_courses_from_api():
+                yielded = True
+                yield course
+        except (requests.RequestException, ValueError) as e:
+            if yielded:
+                raise  # part of the listing was already consumed downstream
+            logger.warning(f"Course listing via API failed ({str(e)}), falling back to browser scraping...")
+        
+        if not yielded:
+            logger.info("Falling back to browser scraping...")
+            yield from self._get_courses_from_browser()
+        
+    def _process_modules_via_api(self, course_id, course_dir):
+        """Enumerate module items through the REST API.
+        
+        include[]=items piggybacks each module's item list on the module
+        listing itself. File items carry their content ID, which the
+        download path resolves to a signed URL with one more JSON request.
+        Returns None when the API is not accessible for this course.
+        """
+        url = f"{self.canvas_url}/api/v1/courses/{course_id}/modules"
+        try:
+            modules = list(self._api_paginate(url, {"include[]": "items"}))
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code in (401, 403, 404):
+                logger.warning(f"Modules API not accessible for course {course_id} "
+                               f"({e.response.status_code})")
+                return None
+            raise
+        
+        if not modules:
+            logger.info("No modules found for this course")
+            return False
+        
+        files_found = False
+        for module in modules:
+            module_dir = os.path.join(course_dir, self._sanitize_filename(module.get("name") or "Module"))
+            items = module.get("items") or []
+            file_items = [item for item in items if item.get("type") == "File"]
+            if not file_items:
+                continue
+            os.makedirs(module_dir, exist_ok=True)
+            for item in file_items:
+                file_url = f"{self.canvas_url}/courses/{course_id}/files/{item['content_id']}"
+                safe_file_name = self._derive_filename(file_url, item.get("title") or "")
+                if self._download_file(file_url, os.path.join(module_dir, safe_file_name)):
+                    files_found = True
+        
+        logger.info(f"Processed {len(modules)} modules through the API")
+        return files_found
+        
+    def _api_paginate(self, url, params=None):
+        """Yield every item of a paginated Canvas API collection.
+        
+        Requests 100 items per page and follows the RFC 5988 Link header,
+        stripping the while(1); guard Canvas prepends to cookie-authenticated
+        JSON responses.
+        """
+        params = dict(params or {}, per_page=100)
+        while url:
+            response = self.session.get(url, params=params, timeout=30)
+            response.raise_for_status()
+            
+            text = response.text
+            if text.startswith("while(1);"):
+                text = text[len("while(1);"):]
+            
+            yield from json.loads(text)
+            
+            # The next link carries the query string itself
+            url = response.links.get("next", {}).get("url")
+            params = None
+        
+    def _get_courses_from_api(self):
+        """Yield courses from the Canvas REST API using the authenticated session"""
+        count = 0
+        listing = self._api_paginate(f"{self.canvas_url}/api/v1/courses",
+                                     {"enrollment_state": "active"})
+        for course in listing:
+            if not course.get("id") or not course.get("name"):
+                continue
+            count += 1
+            yield {
+                "id": str(course["id"]),
+                "name": course["name"],
+                "url": f"{self.canvas_url}/courses/{course['id']}"
+            }
+        
+        logger.info(f"Found {count} courses via the API")
+        
+    def _get_courses_from_browser(self):
+        """Get courses by scraping the Canvas web UI with Selenium"""
         try:
             # Navigate to the courses page
             self.driver.get(f"{self.canvas_url}/courses")
-            time.sleep(self.delay)  # Add delay for visibility
+            self._pause()
             
             # Take a screenshot of the courses page
             self._take_screenshot("courses_page")
             
-            # First try to find courses in the dashboard card view
-            courses = self._get_courses_from_dashboard()
+            # One polled DOM probe picks the right strategy up front, instead
+            # of letting each strategy in a waterfall pay its own full wait
+            # and timeout when its markup was never going to appear
+            probe_script = """
+                if (document.querySelector('.ic-DashboardCard')) return 'dashboard';
+                if (document.querySelector('table.course-list, table.ic-Table')) return 'table';
+                if (document.querySelector("a[href*='/courses/']")) return 'list';
+                return '';
+            """
+            try:
+                strategy = WebDriverWait(self.driver, 10).until(
+                    lambda d: d.execute_script(probe_script)
+                )
+            except TimeoutException:
+                logger.info("No course markup appeared, trying course list view anyway...")
+                strategy = "list"
             
-            # If no courses found in dashboard view, try the "All Courses" table view
-            if not courses:
-                logger.info("No courses found in dashboard view, trying 'All Courses' table view...")
+            if strategy == "dashboard":
+                courses = self._get_courses_from_dashboard()
+            elif strategy == "table":
                 courses = self._get_courses_from_all_courses_table()
-            
-            if courses:
-                logger.info(f"Found {len(courses)} courses")
-                return courses
             else:
-                # If still no courses found, try one more approach - the course list view
-                logger.info("No courses found in table view, trying course list view...")
-                return self._get_courses_from_list_view()
+                courses = self._get_courses_from_list_view()
+            
+            # The probe can race late page hydration; the list-view scan is
+            # the broadest net, so use it as the last resort
+            if not courses and strategy != "list":
+                logger.info(f"No courses found in {strategy} view, trying course list view...")
+                courses = self._get_courses_from_list_view()
+            
+            return courses
             
         except Exception as e:
             logger.error(f"Error fetching courses: {str(e)}")
-            logger.error(traceback.format_exc())
+            logger.error("Traceback:", exc_info=True)
             self._take_screenshot("courses_error")
             return []
             
     def _get_courses_from_dashboard(self):
         """Get courses from the dashboard card view"""
         try:
-            # Check if dashboard cards are present
-            if not self.driver.find_elements(By.CLASS_NAME, "ic-DashboardCard"):
+            # A single short wait doubles as the presence check; the old code
+            # scanned the DOM once with find_elements and then waited on the
+            # exact same selector again
+            logger.info("Waiting for dashboard course cards to load...")
+            try:
+                WebDriverWait(self.driver, 3).until(
+                    EC.presence_of_element_located((By.CLASS_NAME, "ic-DashboardCard"))
+                )
+            except TimeoutException:
                 logger.info("No dashboard cards found")
                 return []
-                
-            # Wait for course cards to load
-            logger.info("Waiting for dashboard course cards to load...")
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "ic-DashboardCard"))
-            )
             
-            # Get all course cards
-            course_cards = self.driver.find_elements(By.CLASS_NAME, "ic-DashboardCard")
-            logger.info(f"Found {len(course_cards)} dashboard course cards")
+            # Pull every card's name and link out in a single script call
+            # instead of paying a WebDriver round trip per attribute
+            cards = self.driver.execute_script("""
+                return Array.from(document.querySelectorAll('.ic-DashboardCard')).map(c => {
+                    const a = c.querySelector('a.ic-DashboardCard__link');
+                    const t = c.querySelector('.ic-DashboardCard__header-title');
+                    return {href: a && a.href, name: t && t.textContent.trim()};
+                });
+            """)
+            logger.info(f"Found {len(cards)} dashboard course cards")
             
             courses = []
-            for card in course_cards:
+            for card in cards:
                 try:
-                    title_element = card.find_element(By.CLASS_NAME, "ic-DashboardCard__header-title")
-                    course_name = title_element.text.strip()
-                    
-                    # Get the course URL from the card
-                    link_element = card.find_element(By.CSS_SELECTOR, "a.ic-DashboardCard__link")
-                    course_url = link_element.get_attribute("href")
+                    course_url = card.get("href")
+                    course_name = card.get("name") or ""
+                    if not course_url or not course_name:
+                        continue
                     
                     # Extract course ID from URL
-                    course_id = course_url.split("/courses/")[1].split("/")[0]
+                    m = _COURSE_ID_RE.search(course_url)
+                    if not m:
+                        continue
                     
                     courses.append({
-                        "id": course_id,
+                        "id": m.group(1),
                         "name": course_name,
                         "url": course_url
                     })
-                    
-                    logger.info(f"Found dashboard course: {course_name} (ID: {course_id})")
                 except Exception as e:
                     logger.error(f"Error processing dashboard course card: {str(e)}")
-                    logger.debug(traceback.format_exc())
+                    logger.debug("Traceback:", exc_info=True)
             
+            logger.info("Found %d dashboard courses: %s",
+                        len(courses), [c["id"] for c in courses])
             return courses
             
         except Exception as e:
             logger.error(f"Error fetching dashboard courses: {str(e)}")
-            logger.debug(traceback.format_exc())
+            logger.debug("Traceback:", exc_info=True)
             return []
             
     def _get_courses_from_all_courses_table(self):
@@ -557,116 +1081,193 @@ class CanvasScraper:
                 if all_courses_links:
                     logger.info("Clicking 'All Courses' link...")
                     all_courses_links[0].click()
-                    time.sleep(self.delay)
+                    self._pause()
                 else:
                     # Try navigating directly to the all courses URL
                     logger.info("Navigating to All Courses page...")
                     self.driver.get(f"{self.canvas_url}/courses/all_courses")
-                    time.sleep(self.delay)
+                    self._pause()
             
             # Take a screenshot of the All Courses page
             self._take_screenshot("all_courses_page")
             
             # Wait for the course table to load
             logger.info("Waiting for course table to load...")
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "table.course-list, table.ic-Table"))
-            )
+            try:
+                WebDriverWait(self.driver, 10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "table.course-list, table.ic-Table"))
+                )
+            except TimeoutException:
+                logger.info("No course table found")
+                return []
             
-            # Find all course rows in the table
-            course_rows = self.driver.find_elements(By.CSS_SELECTOR, "table.course-list tr, table.ic-Table tr")
-            logger.info(f"Found {len(course_rows)} rows in course table")
+            # One script call snapshots every course link in the table as
+            # plain (href, text) pairs; walking the rows through WebElements
+            # costs several WebDriver round trips per row and risks stale
+            # references if the table re-renders mid-iteration
+            rows_data = self.driver.execute_script("""
+                return Array.from(document.querySelectorAll(
+                    "table.course-list tr a[href*='/courses/'], table.ic-Table tr a[href*='/courses/']"
+                )).map(a => [a.href, a.textContent.trim()]);
+            """)
+            logger.info(f"Found {len(rows_data)} course links in course table")
             
             courses = []
-            # Skip the header row
-            for row in course_rows[1:]:
-                try:
-                    # Find the course name and link
-                    course_link = row.find_element(By.CSS_SELECTOR, "a[href*='/courses/']")
-                    course_name = course_link.text.strip()
-                    course_url = course_link.get_attribute("href")
-                    
-                    # Extract course ID from URL
-                    if "/courses/" in course_url:
-                        course_id = course_url.split("/courses/")[1].split("/")[0]
-                        
-                        courses.append({
-                            "id": course_id,
-                            "name": course_name,
-                            "url": course_url
-                        })
-                        
-                        logger.info(f"Found table course: {course_name} (ID: {course_id})")
-                except Exception as e:
-                    logger.error(f"Error processing course row: {str(e)}")
-                    logger.debug(traceback.format_exc())
+            for course_url, course_name in rows_data:
+                # Extract course ID from URL
+                m = _COURSE_ID_RE.search(course_url)
+                if m:
+                    courses.append({
+                        "id": m.group(1),
+                        "name": course_name,
+                        "url": course_url
+                    })
             
+            logger.info("Found %d table courses: %s",
+                        len(courses), [c["id"] for c in courses])
             return courses
             
         except Exception as e:
             logger.error(f"Error fetching courses from table: {str(e)}")
-            logger.debug(traceback.format_exc())
+            logger.debug("Traceback:", exc_info=True)
             self._take_screenshot("table_courses_error")
             return []
             
     def _get_courses_from_list_view(self):
         """Get courses from the course list view"""
         try:
-            # Check if we need to navigate to the courses page
-            if not self.driver.current_url.endswith("/courses"):
-                logger.info("Navigating to courses page...")
-                self.driver.get(f"{self.canvas_url}/courses")
-                time.sleep(self.delay)
-            
-            # Take a screenshot of the courses page
-            self._take_screenshot("courses_list_page")
-            
-            # Look for course links in any format
+            # With the session cookies exported, the page can be fetched once
+            # over HTTP and parsed locally instead of querying the live DOM
+            # through N WebDriver round trips
             logger.info("Looking for course links...")
-            course_links = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/courses/']")
+            course_links = None
+            try:
+                html = self.session.get(f"{self.canvas_url}/courses", timeout=30).text
+                soup = BeautifulSoup(html, _BS_PARSER)
+                course_links = [
+                    {"href": urljoin(self.canvas_url, a.get("href", "")),
+                     "text": a.get_text(strip=True)}
+                    for a in soup.select("a[href*='/courses/']")
+                ]
+            except requests.RequestException as e:
+                logger.warning(f"HTTP fetch of courses page failed ({str(e)}), reading the browser DOM instead...")
+            
+            if course_links is None:
+                # Fall back to the live page already open in the browser
+                if not self.driver.current_url.endswith("/courses"):
+                    logger.info("Navigating to courses page...")
+                    self.driver.get(f"{self.canvas_url}/courses")
+                    self._pause()
+                self._take_screenshot("courses_list_page")
+                course_links = self.driver.execute_script("""
+                    return Array.from(document.querySelectorAll("a[href*='/courses/']"))
+                        .map(a => ({href: a.href, text: a.textContent.trim()}));
+                """)
             logger.info(f"Found {len(course_links)} potential course links")
             
             courses = []
+            seen_ids = set()
             for link in course_links:
                 try:
-                    course_url = link.get_attribute("href")
+                    course_url = link["href"]
                     
                     # Skip links that don't point directly to a course
                     if "/courses/all" in course_url or "/courses/favorites" in course_url or "/courses/search" in course_url:
                         continue
                         
                     # Extract course ID from URL
-                    if "/courses/" in course_url:
-                        parts = course_url.split("/courses/")[1].split("/")
-                        if len(parts) > 0 and parts[0].isdigit():
-                            course_id = parts[0]
-                            course_name = link.text.strip()
+                    m = _COURSE_ID_RE.search(course_url)
+                    if m:
+                        course_id = m.group(1)
+                        course_name = link["text"]
+                        
+                        # Skip empty or navigation links
+                        if not course_name or course_name.lower() in ["all courses", "dashboard", "courses"]:
+                            continue
                             
-                            # Skip empty or navigation links
-                            if not course_name or course_name.lower() in ["all courses", "dashboard", "courses"]:
-                                continue
-                                
-                            # Check if this course is already in our list
-                            if not any(c["id"] == course_id for c in courses):
-                                courses.append({
-                                    "id": course_id,
-                                    "name": course_name,
-                                    "url": course_url
-                                })
-                                
-                                logger.info(f"Found list course: {course_name} (ID: {course_id})")
+                        # The same course appears in nav, sidebar and card
+                        # links; a set makes the dedup O(1) per link
+                        if course_id not in seen_ids:
+                            seen_ids.add(course_id)
+                            courses.append({
+                                "id": course_id,
+                                "name": course_name,
+                                "url": course_url
+                            })
                 except Exception as e:
                     logger.error(f"Error processing course link: {str(e)}")
-                    logger.debug(traceback.format_exc())
+                    logger.debug("Traceback:", exc_info=True)
             
+            logger.info("Found %d list courses: %s",
+                        len(courses), [c["id"] for c in courses])
             return courses
             
         except Exception as e:
             logger.error(f"Error fetching courses from list: {str(e)}")
-            logger.debug(traceback.format_exc())
+            logger.debug("Traceback:", exc_info=True)
             self._take_screenshot("list_courses_error")
             return []
     
+    def _init_driver_pool(self):
+        """Start the worker browsers on the Selenium Grid hub.
+        
+        Each remote browser replays the cookies from the already logged-in
+        local session, so the workers skip the auth flow entirely.
+        """
+        logger.info(f"Starting {self.workers} remote browsers on {self.grid_url}...")
+        cookies = self.driver.get_cookies() if self.driver else []
+        self._driver_pool = queue.Queue()
+        
+        for _ in range(self.workers):
+            options = webdriver.ChromeOptions()
+            options.page_load_strategy = "eager"
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.default_content_setting_values.notifications": 2,
+            })
+            options.add_argument("--disable-dev-shm-usage")
+            if self.headless:
+                options.add_argument("--headless")
+                options.add_argument("--window-size=1920,1080")
+            
+            remote = webdriver.Remote(command_executor=self.grid_url, options=options)
+            remote.implicitly_wait(0)
+            self._block_asset_requests(remote)
+            
+            # Cookies can only be added for the current domain, so land on
+            # Canvas first and then replay the logged-in session
+            remote.get(self.canvas_url)
+            for cookie in cookies:
+                try:
+                    remote.add_cookie({k: v for k, v in cookie.items()
+                                       if k in ("name", "value", "path", "domain", "secure", "expiry")})
+                except Exception:
+                    pass
+            
+            self._driver_pool.put(remote)
+            
+    def _shutdown_driver_pool(self):
+        """Quit every browser in the Grid pool"""
+        while self._driver_pool and not self._driver_pool.empty():
+            try:
+                self._driver_pool.get_nowait().quit()
+            except Exception as e:
+                logger.warning(f"Error closing pooled browser: {str(e)}")
+                
+    def _process_course_with_pooled_driver(self, course):
+        """Check a browser out of the pool and process one course with it"""
+        driver = self._driver_pool.get()
+        self._local.driver = driver
+        try:
+            self.process_course(course)
+        except Exception as e:
+            logger.error(f"Error processing course {course['name']}: {str(e)}")
+            logger.debug("Traceback:", exc_info=True)
+        finally:
+            self._local.driver = None
+            self._driver_pool.put(driver)
+            
     def process_course(self, course):
         """Process a single course and download all its files"""
         course_id = course["id"]
@@ -679,14 +1280,32 @@ class CanvasScraper:
         
         logger.info(f"\nProcessing course: {course_name}")
         
-        # First, try to find files on the course homepage and in modules
-        homepage_files_found = self._process_course_homepage(course_id, course_name, course_dir)
+        # One directory walk up front replaces a pair of stat calls per
+        # discovered link when deciding whether to skip a download
+        self._index_existing(course_dir)
         
-        # Then, try to find files in the modules section
-        modules_files_found = self._process_course_modules(course_id, course_name, course_dir)
+        # Walk the Files API in the background while Selenium is busy with
+        # the homepage and modules; the manifest is usually ready by the
+        # time the files section is reached
+        prefetch_pool = ThreadPoolExecutor(max_workers=1)
+        manifest_future = prefetch_pool.submit(
+            self._collect_files_via_api, course_id, os.path.join(course_dir, "Files"))
         
-        # Finally, try the dedicated Files section as a fallback
-        files_section_found = self._process_course_files_section(course_id, course_name, course_dir)
+        try:
+            # First, try to find files on the course homepage and in modules
+            homepage_files_found = self._process_course_homepage(course_id, course_name, course_dir)
+            
+            # Then, try to find files in the modules section
+            modules_files_found = self._process_course_modules(course_id, course_name, course_dir)
+            
+            # Finally, try the dedicated Files section as a fallback
+            files_section_found = self._process_course_files_section(
+                course_id, course_name, course_dir, manifest_future)
+        finally:
+            prefetch_pool.shutdown(wait=False)
+        
+        # Transfer everything the walk queued, overlapping the requests
+        self._drain_downloads()
         
         if not (homepage_files_found or modules_files_found or files_section_found):
             logger.warning(f"No files found for course: {course_name}")
@@ -695,30 +1314,38 @@ class CanvasScraper:
         """Process the course homepage for downloadable files"""
         logger.info(f"Checking course homepage for files: {course_name}")
         
-        # Navigate to the course homepage
         homepage_url = f"{self.canvas_url}/courses/{course_id}"
-        logger.info(f"Navigating to course homepage: {homepage_url}")
-        self.driver.get(homepage_url)
-        time.sleep(self.delay)  # Add delay for visibility
         
-        # Take a screenshot of the course homepage
-        safe_course_name = self._sanitize_filename(course_name)
-        self._take_screenshot(f"homepage_{safe_course_name}")
+        # Try plain HTTP + parse first; Selenium is only needed when the
+        # homepage turns out to be client-rendered
+        page_links = self._fetch_page_links(homepage_url)
+        if page_links is None:
+            logger.info(f"Navigating to course homepage: {homepage_url}")
+            self.driver.get(homepage_url)
+            # Wait for the content we actually consume instead of sleeping
+            try:
+                self._wait_for((By.TAG_NAME, "a"), timeout=15)
+            except TimeoutException:
+                logger.warning("Course homepage rendered no links")
+            
+            # Take a screenshot of the course homepage
+            safe_course_name = self._sanitize_filename(course_name)
+            self._take_screenshot(f"homepage_{safe_course_name}")
         
         # First, check for direct downloadable links on the homepage
-        direct_files_found = self._process_direct_links(course_dir, "Homepage_Direct")
+        direct_files_found = self._process_direct_links(course_dir, "Homepage_Direct", page_links)
         
-        # Then, click on each link on the homepage and look for downloadable files
-        indirect_files_found = self._process_clickable_links(course_dir, "Homepage", homepage_url)
+        # Then, follow each link on the homepage and look for downloadable files
+        indirect_files_found = self._process_clickable_links(course_dir, "Homepage", homepage_url, page_links)
         
         return direct_files_found or indirect_files_found
         
-    def _process_direct_links(self, course_dir, subfolder_name):
+    def _process_direct_links(self, course_dir, subfolder_name, page_links=None):
         """Process direct downloadable links on the current page"""
         logger.info(f"Looking for direct downloadable links on the current page")
         
         # Look for file links on the page
-        file_links = self._find_downloadable_links()
+        file_links = self._find_downloadable_links(page_links)
         
         if file_links:
             logger.info(f"Found {len(file_links)} direct downloadable links")
@@ -731,61 +1358,45 @@ class CanvasScraper:
             files_downloaded = False
             for link in file_links:
                 try:
-                    file_url = link.get_attribute("href")
-                    file_name = link.text.strip()
-                    
-                    # If the link text is empty, try to get the filename from the URL
-                    if not file_name:
-                        file_name = os.path.basename(urlparse(file_url).path)
-                        # Remove any query parameters
-                        file_name = file_name.split("?")[0]
-                        # URL decode the filename
-                        file_name = unquote(file_name)
+                    file_url = link["href"]
+                    safe_file_name = self._derive_filename(file_url, link["text"])
                     
-                    # Sanitize the filename
-                    safe_file_name = self._sanitize_filename(file_name)
-                    if not safe_file_name.endswith(('.pdf', '.doc', '.docx', '.ppt', '.pptx', '.xls', '.xlsx', '.txt', '.zip')):
-                        safe_file_name += '.pdf'  # Default extension if none is detected
-                        
                     # Download the file
                     if self._download_file(file_url, os.path.join(subfolder_dir, safe_file_name)):
                         files_downloaded = True
-                except Exception as e:
+                except (WebDriverException, requests.RequestException, OSError) as e:
                     logger.error(f"Error downloading direct file: {str(e)}")
-                    logger.debug(traceback.format_exc())
+                    logger.debug("Traceback:", exc_info=True)
             
             return files_downloaded
         else:
             logger.info("No direct downloadable links found")
             return False
             
-    def _process_clickable_links(self, course_dir, subfolder_name, return_url):
+    def _process_clickable_links(self, course_dir, subfolder_name, return_url, page_links=None):
         """Process clickable links on the current page and look for downloadable files on the resulting pages"""
         logger.info(f"Looking for clickable links on the current page")
         
-        # Get all links on the page
-        all_links = self.driver.find_elements(By.TAG_NAME, "a")
+        # Get all links on the page in a single round trip
+        all_links = page_links if page_links is not None else self._collect_links_js()
         
         # Filter out navigation links and empty links
         content_links = []
         for link in all_links:
-            try:
-                href = link.get_attribute("href")
-                text = link.text.strip()
+            href = link["href"]
+            text = link["text"]
+            
+            # Skip empty links and navigation links
+            if not href or not text:
+                continue
                 
-                # Skip empty links, navigation links, and links we can't interact with
-                if not href or not text:
-                    continue
-                    
-                # Skip common navigation links
-                if text.lower() in ["home", "announcements", "grades", "people", "files", "syllabus", "modules", "settings", "dashboard"]:
-                    continue
-                    
-                # Skip links to external sites
-                if href and self.canvas_url in href:
-                    content_links.append((href, text))
-            except:
-                pass
+            # Skip common navigation links
+            if text.lower() in ["home", "announcements", "grades", "people", "files", "syllabus", "modules", "settings", "dashboard"]:
+                continue
+                
+            # Skip links to external sites
+            if self.canvas_url in href:
+                content_links.append((href, text))
                 
         logger.info(f"Found {len(content_links)} content links to process")
         
@@ -801,23 +1412,52 @@ class CanvasScraper:
         
         # Process each link
         for i, (link_url, link_text) in enumerate(content_links):
+            opened_tab = False
+            norm_url = urlsplit(link_url)._replace(fragment="").geturl()
             try:
                 logger.info(f"Processing link {i+1}/{len(content_links)}: {link_text}")
-                
-                # Navigate to the link
-                self.driver.get(link_url)
-                time.sleep(self.delay * 2)  # Add extra delay for page to load
-                
-                # Take a screenshot
                 safe_name = self._sanitize_filename(link_text)
-                self._take_screenshot(f"link_{safe_name}")
                 
                 # Create a subfolder for this link
                 link_dir = os.path.join(subfolder_dir, safe_name)
                 os.makedirs(link_dir, exist_ok=True)
                 
+                # A page scraped earlier (this run or a previous one) queues
+                # its known downloads without being visited again
+                cached_specs = self._visited_urls.get(norm_url)
+                if cached_specs is not None:
+                    logger.info(f"Using cached downloads for already-visited page: {link_text}")
+                    for download_url, file_name in cached_specs:
+                        if self._download_file(download_url, os.path.join(link_dir, file_name), direct=True):
+                            files_downloaded = True
+                    continue
+                
+                queued_before = len(self._pending_downloads)
+                
+                # Fetch the linked page over HTTP when possible; only
+                # client-rendered pages need a Chrome navigation
+                page_links = self._fetch_page_links(link_url)
+                if page_links is None:
+                    # Open in a new tab so the original page's DOM survives;
+                    # closing a tab is far cheaper than re-navigating back
+                    self.driver.execute_script("window.open(arguments[0], '_blank');", link_url)
+                    self.driver.switch_to.window(self.driver.window_handles[-1])
+                    opened_tab = True
+                    # Wait for the document to finish loading rather than
+                    # padding every link with a fixed sleep
+                    try:
+                        WebDriverWait(self.driver, 15).until(
+                            lambda d: d.execute_script("return document.readyState") == "complete"
+                        )
+                    except TimeoutException:
+                        logger.warning(f"Page did not finish loading: {link_url}")
+
+                    
+                    # Collect the page's links once and reuse them for every check below
+                    page_links = self._collect_links_js()
+                
                 # Look for download links on this page
-                download_links = self._find_enhanced_download_links()
+                download_links = self._find_enhanced_download_links(page_links)
                 
                 if download_links:
                     logger.info(f"Found {len(download_links)} download links on page: {link_text}")
@@ -825,66 +1465,47 @@ class CanvasScraper:
                     # Download each file
                     for dl_link in download_links:
                         try:
-                            file_url = dl_link.get_attribute("href")
-                            file_name = dl_link.text.strip()
+                            file_url = dl_link["href"]
+                            safe_file_name = self._derive_filename(file_url, dl_link["text"], link_text)
                             
-                            # If the link text is empty, try to get the filename from the URL or use the parent link text
-                            if not file_name:
-                                file_name = os.path.basename(urlparse(file_url).path)
-                                # Remove any query parameters
-                                file_name = file_name.split("?")[0]
-                                # URL decode the filename
-                                file_name = unquote(file_name)
-                                
-                            # If still no filename, use the parent link text
-                            if not file_name or file_name == "":
-                                file_name = link_text
-                            
-                            # Sanitize the filename
-                            safe_file_name = self._sanitize_filename(file_name)
-                            if not safe_file_name.endswith(('.pdf', '.doc', '.docx', '.ppt', '.pptx', '.xls', '.xlsx', '.txt', '.zip')):
-                                safe_file_name += '.pdf'  # Default extension if none is detected
-                                
                             # Download the file
                             if self._download_file(file_url, os.path.join(link_dir, safe_file_name)):
                                 files_downloaded = True
-                        except Exception as e:
+                        except (WebDriverException, requests.RequestException, OSError) as e:
                             logger.error(f"Error downloading file from link page: {str(e)}")
-                            logger.debug(traceback.format_exc())
+                            logger.debug("Traceback:", exc_info=True)
                 else:
                     # If no download links found, check for Canvas-specific download buttons
                     try:
                         # Look for Canvas download buttons
-                        download_buttons = self.driver.find_elements(By.CSS_SELECTOR, 
-                            "a.icon-download, a.file_download_btn, a[download], a.download_submissions_link")
+                        download_buttons = [l for l in page_links
+                                            if "icon-download" in l["cls"] or "file_download_btn" in l["cls"]
+                                            or "download_submissions_link" in l["cls"] or l["download"]]
                         
                         if download_buttons:
                             logger.info(f"Found {len(download_buttons)} Canvas download buttons")
                             
                             for button in download_buttons:
                                 try:
-                                    download_url = button.get_attribute("href")
+                                    download_url = button["href"]
                                     if not download_url:
                                         continue
                                         
                                     # Try to get a filename
-                                    file_name = button.get_attribute("download") or button.get_attribute("title") or link_text
+                                    safe_file_name = self._derive_filename(
+                                        download_url, button["download"] or button["title"], link_text)
                                     
-                                    # Sanitize the filename
-                                    safe_file_name = self._sanitize_filename(file_name)
-                                    if not safe_file_name.endswith(('.pdf', '.doc', '.docx', '.ppt', '.pptx', '.xls', '.xlsx', '.txt', '.zip')):
-                                        safe_file_name += '.pdf'  # Default extension if none is detected
-                                        
                                     # Download the file
                                     if self._download_file(download_url, os.path.join(link_dir, safe_file_name)):
                                         files_downloaded = True
-                                except Exception as e:
+                                except (WebDriverException, requests.RequestException, OSError) as e:
                                     logger.error(f"Error downloading from Canvas button: {str(e)}")
-                                    logger.debug(traceback.format_exc())
+                                    logger.debug("Traceback:", exc_info=True)
                         else:
-                            # If still no download buttons, try clicking on any file links in the content
-                            file_links = self.driver.find_elements(By.CSS_SELECTOR, 
-                                "a.instructure_file_link, a.inline_disabled, a[id^='file_']")
+                            # If still no download buttons, try any file links in the content
+                            file_links = [l for l in page_links
+                                          if "instructure_file_link" in l["cls"] or "inline_disabled" in l["cls"]
+                                          or l["id"].startswith("file_")]
                             
                             if file_links:
                                 logger.info(f"Found {len(file_links)} file links in content")
@@ -892,68 +1513,59 @@ class CanvasScraper:
                                 for file_link in file_links:
                                     try:
                                         # Get the link URL and text
-                                        file_url = file_link.get_attribute("href")
-                                        file_name = file_link.text.strip() or link_text
+                                        file_url = file_link["href"]
+                                        safe_file_name = self._derive_filename(file_url, file_link["text"], link_text)
                                         
-                                        # Sanitize the filename
-                                        safe_file_name = self._sanitize_filename(file_name)
-                                        if not safe_file_name.endswith(('.pdf', '.doc', '.docx', '.ppt', '.pptx', '.xls', '.xlsx', '.txt', '.zip')):
-                                            safe_file_name += '.pdf'  # Default extension if none is detected
-                                            
                                         # Download the file
                                         if self._download_file(file_url, os.path.join(link_dir, safe_file_name)):
                                             files_downloaded = True
-                                    except Exception as e:
+                                    except (WebDriverException, requests.RequestException, OSError) as e:
                                         logger.error(f"Error downloading from file link: {str(e)}")
-                                        logger.debug(traceback.format_exc())
+                                        logger.debug("Traceback:", exc_info=True)
                     except Exception as e:
                         logger.error(f"Error checking for Canvas-specific elements: {str(e)}")
-                        logger.debug(traceback.format_exc())
+                        logger.debug("Traceback:", exc_info=True)
+                
+                # Remember what this page yielded so it is never re-scraped
+                self._visited_urls[norm_url] = [
+                    [download_url, os.path.basename(file_path)]
+                    for download_url, file_path in self._pending_downloads[queued_before:]
+                ]
                 
             except Exception as e:
                 logger.error(f"Error processing link {link_text}: {str(e)}")
-                logger.debug(traceback.format_exc())
+                logger.debug("Traceback:", exc_info=True)
                 
-            # Navigate back to the original page
-            self.driver.get(return_url)
-            time.sleep(self.delay)  # Add delay for visibility
+            # Drop the tab; the original page is still loaded in the first one
+            if opened_tab:
+                self.driver.close()
+                self.driver.switch_to.window(self.driver.window_handles[0])
         
         return files_downloaded
         
-    def _find_enhanced_download_links(self):
+    def _find_enhanced_download_links(self, page_links=None):
         """Find all downloadable links on the current page with enhanced detection"""
-        # Start with basic downloadable links
-        downloadable_links = self._find_downloadable_links()
+        if page_links is None:
+            page_links = self._collect_links_js()
         
-        # Also look for Canvas-specific download links
-        try:
-            canvas_download_links = self.driver.find_elements(By.CSS_SELECTOR, 
-                "a.file_download_btn, a.icon-download, a[download], a.instructure_file_link")
-            
-            for link in canvas_download_links:
-                try:
-                    href = link.get_attribute("href")
-                    if href and href not in [dl.get_attribute("href") for dl in downloadable_links]:
-                        downloadable_links.append(link)
-                except:
-                    pass
-        except:
-            pass
-            
-        # Look for links with specific text that suggests they are downloads
-        try:
-            text_download_links = self.driver.find_elements(By.XPATH, 
-                "//a[contains(text(), 'Download') or contains(text(), 'download') or contains(text(), '.pdf') or contains(text(), '.doc')]")
-            
-            for link in text_download_links:
-                try:
-                    href = link.get_attribute("href")
-                    if href and href not in [dl.get_attribute("href") for dl in downloadable_links]:
-                        downloadable_links.append(link)
-                except:
-                    pass
-        except:
-            pass
+        # Start with basic downloadable links; the set makes each dedup
+        # check O(1) instead of rescanning the accumulated list per link
+        downloadable_links = self._find_downloadable_links(page_links)
+        seen_hrefs = {dl["href"] for dl in downloadable_links}
+        
+        # One pass catches both Canvas-specific download markup and link
+        # text that suggests a download
+        for link in page_links:
+            href = link["href"]
+            if not href or href in seen_hrefs:
+                continue
+            cls = link["cls"]
+            text = link["text"].lower()
+            if ("file_download_btn" in cls or "icon-download" in cls
+                    or "instructure_file_link" in cls or link["download"]
+                    or "download" in text or ".pdf" in text or ".doc" in text):
+                seen_hrefs.add(href)
+                downloadable_links.append(link)
                 
         return downloadable_links
             
@@ -961,15 +1573,26 @@ class CanvasScraper:
         """Process the course modules for downloadable files"""
         logger.info(f"Checking course modules for files: {course_name}")
         
+        # The modules listing embeds its items over the REST API, so a
+        # whole modules page costs a couple of JSON requests instead of a
+        # Selenium render plus per-module expansion clicks
+        try:
+            found = self._process_modules_via_api(course_id, course_dir)
+            if found is not None:
+                return found
+        except (requests.RequestException, ValueError) as e:
+            logger.warning(f"Modules API enumeration failed ({str(e)}), falling back to browser...")
+        
         # Navigate to the modules page
         modules_url = f"{self.canvas_url}/courses/{course_id}/modules"
         logger.info(f"Navigating to modules page: {modules_url}")
         self.driver.get(modules_url)
-        time.sleep(self.delay)  # Add delay for visibility
-        
-        # Take a screenshot of the modules page
-        safe_course_name = self._sanitize_filename(course_name)
-        self._take_screenshot(f"modules_{safe_course_name}")
+        # Wait for the module list (or the explicit empty state) to render
+        try:
+            self._wait_for((By.CSS_SELECTOR, ".context_module, .no-modules"), timeout=15)
+        except TimeoutException:
+            pass  # handled by the module check below
+
         
         # Check if there are any modules
         modules = self.driver.find_elements(By.CSS_SELECTOR, ".context_module")
@@ -979,14 +1602,46 @@ class CanvasScraper:
             
         logger.info(f"Found {len(modules)} modules")
         
+        # Expand every collapsed module first so the batch extraction below
+        # sees all items
+        for module in modules:
+            try:
+                if "collapsed" in module.get_attribute("class"):
+                    # A JS click skips Selenium's scroll-into-view/focus
+                    # dance, and waiting on the class beats a fixed sleep
+                    expand_button = module.find_element(By.CSS_SELECTOR, ".expand_module_link")
+                    self.driver.execute_script("arguments[0].click()", expand_button)
+                    WebDriverWait(self.driver, 5).until(
+                        lambda d: "collapsed" not in module.get_attribute("class")
+                    )
+            except (StaleElementReferenceException, WebDriverException) as e:
+                logger.info(f"Module may already be expanded or couldn't expand: {str(e)}")
+        
+        # One script call returns every module with its items and links;
+        # reading the same data through WebElements costs several RPCs per
+        # item, which adds up to hundreds per modules page
+        modules_data = self.driver.execute_script("""
+            return Array.from(document.querySelectorAll('.context_module')).map(m => {
+                const n = m.querySelector('.name');
+                return {
+                    name: n ? n.textContent.trim() : '',
+                    items: Array.from(m.querySelectorAll('.context_module_item')).map(it => {
+                        const t = it.querySelector('.item_name');
+                        return {
+                            name: t ? t.textContent.trim() : '',
+                            links: Array.from(it.querySelectorAll('a')).map(a => a.href)
+                        };
+                    })
+                };
+            });
+        """)
+        
         files_found = False
         
         # Process each module
-        for i, module in enumerate(modules):
+        for i, module_data in enumerate(modules_data):
             try:
-                # Get the module name
-                module_name_elem = module.find_element(By.CSS_SELECTOR, ".name")
-                module_name = module_name_elem.text.strip()
+                module_name = module_data["name"]
                 safe_module_name = self._sanitize_filename(module_name)
                 
                 logger.info(f"Processing module: {module_name}")
@@ -995,83 +1650,65 @@ class CanvasScraper:
                 module_dir = os.path.join(course_dir, safe_module_name)
                 os.makedirs(module_dir, exist_ok=True)
                 
-                # Try to expand the module if it's collapsed
-                try:
-                    # Check if the module is collapsed
-                    if "collapsed" in module.get_attribute("class"):
-                        # Find and click the expand button
-                        expand_button = module.find_element(By.CSS_SELECTOR, ".expand_module_link")
-                        logger.info(f"Expanding module: {module_name}")
-                        expand_button.click()
-                        time.sleep(self.delay)  # Wait for expansion
-                except Exception as e:
-                    logger.info(f"Module may already be expanded or couldn't expand: {str(e)}")
-                
-                # Find all items in the module
-                module_items = module.find_elements(By.CSS_SELECTOR, ".context_module_item")
-                logger.info(f"Found {len(module_items)} items in module: {module_name}")
+                logger.info(f"Found {len(module_data['items'])} items in module: {module_name}")
                 
                 # Process each item in the module
-                for item in module_items:
-                    try:
-                        # Check if this is a file item
-                        item_classes = item.get_attribute("class")
-                        item_name_elem = item.find_element(By.CSS_SELECTOR, ".item_name")
-                        item_name = item_name_elem.text.strip()
-                        
-                        # Find links in this item
-                        links = item.find_elements(By.TAG_NAME, "a")
-                        
-                        for link in links:
-                            try:
-                                link_url = link.get_attribute("href")
-                                
-                                # Skip if not a file link
-                                if not link_url or not self._is_downloadable_link(link_url):
-                                    continue
-                                    
-                                # Get the file name
-                                file_name = item_name
-                                if not file_name:
-                                    file_name = link.text.strip()
-                                if not file_name:
-                                    file_name = os.path.basename(urlparse(link_url).path)
-                                    file_name = file_name.split("?")[0]  # Remove query parameters
-                                    file_name = unquote(file_name)  # URL decode
-                                
-                                # Sanitize the filename
-                                safe_file_name = self._sanitize_filename(file_name)
-                                if not safe_file_name.endswith(('.pdf', '.doc', '.docx', '.ppt', '.pptx', '.xls', '.xlsx', '.txt', '.zip')):
-                                    safe_file_name += '.pdf'  # Default extension if none is detected
+                for item in module_data["items"]:
+                    for link_url in item["links"]:
+                        try:
+                            # Skip if not a file link
+                            if not link_url or not self._is_downloadable_link(link_url):
+                                continue
                                 
-                                # Download the file
-                                if self._download_file(link_url, os.path.join(module_dir, safe_file_name)):
-                                    files_found = True
-                            except Exception as e:
-                                logger.error(f"Error processing link in module item: {str(e)}")
-                                logger.debug(traceback.format_exc())
-                    except Exception as e:
-                        logger.error(f"Error processing module item: {str(e)}")
-                        logger.debug(traceback.format_exc())
+                            # Get the file name
+                            safe_file_name = self._derive_filename(link_url, item["name"])
+                            
+                            # Download the file
+                            if self._download_file(link_url, os.path.join(module_dir, safe_file_name)):
+                                files_found = True
+                        except (WebDriverException, requests.RequestException, OSError) as e:
+                            logger.error(f"Error processing link in module item: {str(e)}")
+                            logger.debug("Traceback:", exc_info=True)
             except Exception as e:
                 logger.error(f"Error processing module {i+1}: {str(e)}")
-                logger.debug(traceback.format_exc())
+                logger.debug("Traceback:", exc_info=True)
                 
         return files_found
         
-    def _process_course_files_section(self, course_id, course_name, course_dir):
+    def _process_course_files_section(self, course_id, course_name, course_dir, manifest_future=None):
         """Process the dedicated Files section of the course"""
         logger.info(f"Checking Files section for course: {course_name}")
         
+        files_dir = os.path.join(course_dir, "Files")
+        
+        # The Files tree is fully enumerable over the REST API - one JSON
+        # request per folder instead of a full SPA render per folder -
+        # and was usually already walked in the background while Selenium
+        # processed the homepage and modules
+        manifest = None
+        try:
+            if manifest_future is not None:
+                manifest = manifest_future.result()
+            else:
+                manifest = self._collect_files_via_api(course_id, files_dir)
+        except (requests.RequestException, ValueError) as e:
+            logger.warning(f"Files API enumeration failed ({str(e)}), falling back to browser...")
+        
+        if manifest is not None:
+            # The API hands back direct download URLs, so no browser round
+            # trip is needed to resolve them
+            queued = 0
+            for download_url, file_path in manifest:
+                if self._download_file(download_url, file_path, direct=True):
+                    queued += 1
+            logger.info(f"Queued {queued} files from the Files API for course {course_id}")
+            return True
+        
         # Navigate to the Files section of the course
         files_url = f"{self.canvas_url}/courses/{course_id}/files"
         logger.info(f"Navigating to Files section: {files_url}")
         self.driver.get(files_url)
-        time.sleep(self.delay)  # Add delay for visibility
-        
-        # Take a screenshot of the files page
-        safe_course_name = self._sanitize_filename(course_name)
-        self._take_screenshot(f"files_page_{safe_course_name}")
+
         
         # Wait for the files page to load
         try:
@@ -1090,54 +1727,115 @@ class CanvasScraper:
             
         except TimeoutException:
             logger.warning(f"No files found in Files section or section not accessible for course: {course_name}")
-            self._take_screenshot(f"no_files_{safe_course_name}")
+            self._take_screenshot(f"no_files_{self._sanitize_filename(course_name)}")
             return False
             
-    def _find_downloadable_links(self):
+    def _fetch_page_links(self, url):
+        """Fetch a page over HTTP and return its links in _collect_links_js shape.
+        
+        With the login cookies in the requests session, most Canvas pages
+        can be fetched and parsed in tens of milliseconds instead of paying
+        a full Chrome navigation. Returns None when the fetch fails or the
+        page appears client-rendered, in which case the caller should fall
+        back to Selenium.
+        """
+        try:
+            response = self.session.get(url, timeout=30)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.debug("HTTP fetch of %s failed: %s", url, e)
+            return None
+        
+        soup = BeautifulSoup(response.text, _BS_PARSER)
+        links = []
+        for a in soup.find_all("a"):
+            href = a.get("href") or ""
+            links.append({
+                "href": urljoin(url, href) if href else "",
+                "text": a.get_text(strip=True),
+                "download": a.get("download") or "",
+                "title": a.get("title") or "",
+                "id": a.get("id") or "",
+                "cls": " ".join(a.get("class") or []),
+            })
+        
+        if not links:
+            # No server-rendered anchors at all; the browser has to render it
+            return None
+        return links
+        
+    def _collect_links_js(self):
+        """Collect every anchor on the page in one WebDriver round trip.
+        
+        Reading href/text per WebElement costs a JSON-over-HTTP call each;
+        a single script call returns the attributes for every link at once
+        and the filtering happens in Python.
+        """
+        return self.driver.execute_script("""
+            return Array.from(document.querySelectorAll('a')).map(a => ({
+                href: a.href || '',
+                text: a.textContent.trim(),
+                download: a.getAttribute('download') || '',
+                title: a.getAttribute('title') || '',
+                id: a.id || '',
+                cls: a.getAttribute('class') || ''
+            }));
+        """)
+        
+    def _find_downloadable_links(self, page_links=None):
         """Find all downloadable links on the current page"""
-        # Look for links that might be files
-        all_links = self.driver.find_elements(By.TAG_NAME, "a")
+        if page_links is None:
+            page_links = self._collect_links_js()
         
         # Filter for downloadable links
-        downloadable_links = []
-        for link in all_links:
-            try:
-                href = link.get_attribute("href")
-                if href and self._is_downloadable_link(href):
-                    downloadable_links.append(link)
-            except:
-                pass
-                
-        return downloadable_links
-        
-    def _is_downloadable_link(self, url):
-        """Check if a URL is likely to be a downloadable file"""
-        if not url:
-            return False
-            
-        # Check for Canvas file download patterns
-        if "/files/" in url and ("/download" in url or "?download=1" in url or "?download_frd=1" in url):
-            return True
-            
-        # Check for common file extensions
-        file_extensions = ['.pdf', '.doc', '.docx', '.ppt', '.pptx', '.xls', '.xlsx', '.txt', '.zip', 
-                          '.jpg', '.jpeg', '.png', '.gif', '.mp3', '.mp4', '.mov', '.avi']
+        return [link for link in page_links if self._is_downloadable_link(link["href"])]
         
-        for ext in file_extensions:
-            if url.lower().endswith(ext) or f"{ext}?" in url.lower():
-                return True
-                
-        return False
+    # Pure string helpers live at module level so lru_cache doesn't pin self
+    _is_downloadable_link = staticmethod(_is_downloadable_link_impl)
     
+    def _collect_files_via_api(self, course_id, files_dir):
+        """Walk the course Files tree through the REST API.
+        
+        A breadth-first walk over folder IDs: each folder costs one (or a
+        few, when paginated) JSON request instead of a full Files-SPA page
+        load. Returns (download_url, local_path) pairs, or None when the
+        API is not accessible for this course. Safe to run off the main
+        thread - it only touches the requests session and the filesystem.
+        """
+        root_url = f"{self.canvas_url}/api/v1/courses/{course_id}/folders/root"
+        response = self.session.get(root_url, timeout=30)
+        if response.status_code in (401, 403, 404):
+            logger.warning(f"Files API not accessible for course {course_id} ({response.status_code})")
+            return None
+        response.raise_for_status()
+        
+        text = response.text
+        if text.startswith("while(1);"):
+            text = text[len("while(1);"):]
+        root = json.loads(text)
+        
+        folders = deque([(root["id"], files_dir)])
+        manifest = []
+        while folders:
+            folder_id, local_dir = folders.popleft()
+            os.makedirs(local_dir, exist_ok=True)
+            
+            for folder in self._api_paginate(f"{self.canvas_url}/api/v1/folders/{folder_id}/folders"):
+                safe_folder_name = self._sanitize_filename(folder["name"])
+                folders.append((folder["id"], os.path.join(local_dir, safe_folder_name)))
+            
+            for file in self._api_paginate(f"{self.canvas_url}/api/v1/folders/{folder_id}/files"):
+                safe_file_name = self._sanitize_filename(file.get("display_name") or file["filename"])
+                manifest.append((file["url"], os.path.join(local_dir, safe_file_name)))
+        
+        return manifest
+        
     def _process_folder(self, current_dir, folder_url):
-        """Process a folder and its contents recursively"""
+        """Process a folder and its contents recursively (Selenium fallback)"""
         folder_name = os.path.basename(current_dir)
         logger.info(f"Processing folder: {folder_name}")
         self.driver.get(folder_url)
-        time.sleep(self.delay)  # Add delay for visibility
-        
-        # Take a screenshot of the folder
-        self._take_screenshot(f"folder_{self._sanitize_filename(folder_name)}")
+
         
         # Wait for the folder contents to load
         try:
@@ -1149,155 +1847,297 @@ class CanvasScraper:
             logger.warning(f"No items found in folder '{folder_name}' or folder is empty")
             return
         
-        # Get all items in the current folder
-        time.sleep(self.delay)  # Give a moment for all items to load
-        items = self.driver.find_elements(By.CLASS_NAME, "ef-item-row")
-        logger.info(f"Found {len(items)} items in folder '{folder_name}'")
+        # One script call returns class, name and link for every row; the
+        # plain dicts also can't go stale the way WebElements do
+        items_data = self.driver.execute_script("""
+            return Array.from(document.querySelectorAll('.ef-item-row')).map(r => {
+                const n = r.querySelector('.ef-name-col__text');
+                const l = r.querySelector('a.ef-name-col__link');
+                return {cls: r.className || '',
+                        name: n ? n.textContent.trim() : '',
+                        href: l ? l.href : ''};
+            });
+        """)
+        logger.info(f"Found {len(items_data)} items in folder '{folder_name}'")
         
-        # First, process all subfolders
+        # First, process all subfolders. Each row link carries the subfolder
+        # URL, so recursion navigates directly instead of clicking in and
+        # re-loading the parent afterwards.
         subfolder_count = 0
-        for item in items:
+        for item in items_data:
+            if "ef-item-folder" not in item["cls"]:
+                continue
             try:
-                # Check if the item is a folder
-                item_classes = item.get_attribute("class")
-                if "ef-item-folder" in item_classes:
-                    subfolder_count += 1
-                    folder_name_element = item.find_element(By.CLASS_NAME, "ef-name-col__text")
-                    folder_name = folder_name_element.text.strip()
-                    safe_folder_name = self._sanitize_filename(folder_name)
-                    
-                    # Create subfolder
-                    subfolder_path = os.path.join(current_dir, safe_folder_name)
-                    os.makedirs(subfolder_path, exist_ok=True)
-                    logger.info(f"Created subfolder: {safe_folder_name}")
-                    
-                    # Click on the folder to navigate into it
-                    logger.info(f"Navigating into subfolder: {folder_name}")
-                    folder_name_element.click()
-                    time.sleep(self.delay)  # Add delay for visibility
-                    
-                    # Get the current URL (which is now the subfolder URL)
-                    subfolder_url = self.driver.current_url
-                    
-                    # Process the subfolder recursively
-                    self._process_folder(subfolder_path, subfolder_url)
-                    
-                    # Navigate back to the parent folder
-                    logger.info(f"Navigating back to parent folder")
-                    self.driver.get(folder_url)
-                    time.sleep(self.delay)  # Add delay for visibility
-                    
-                    # Wait for the folder contents to load again
-                    WebDriverWait(self.driver, 15).until(
-                        EC.presence_of_element_located((By.CLASS_NAME, "ef-directory"))
-                    )
-                    
-                    # Refresh the items list
-                    time.sleep(self.delay)
-                    items = self.driver.find_elements(By.CLASS_NAME, "ef-item-row")
+                subfolder_count += 1
+                safe_folder_name = self._sanitize_filename(item["name"])
+                
+                # Create subfolder
+                subfolder_path = os.path.join(current_dir, safe_folder_name)
+                os.makedirs(subfolder_path, exist_ok=True)
+                logger.info(f"Created subfolder: {safe_folder_name}")
+                
+                if item["href"]:
+                    self._process_folder(subfolder_path, item["href"])
             except Exception as e:
                 logger.error(f"Error processing subfolder: {str(e)}")
-                logger.debug(traceback.format_exc())
+                logger.debug("Traceback:", exc_info=True)
                 self._take_screenshot(f"subfolder_error_{self._sanitize_filename(folder_name)}")
         
         logger.info(f"Processed {subfolder_count} subfolders in '{folder_name}'")
         
         # Then, process all files
         file_count = 0
-        for item in items:
+        for item in items_data:
+            if "ef-item-folder" in item["cls"]:
+                continue
             try:
-                # Check if the item is a file (not a folder)
-                item_classes = item.get_attribute("class")
-                if "ef-item-folder" not in item_classes:
-                    file_count += 1
-                    file_name_element = item.find_element(By.CLASS_NAME, "ef-name-col__text")
-                    file_name = file_name_element.text.strip()
-                    safe_file_name = self._sanitize_filename(file_name)
-                    
-                    # Get the file URL
-                    file_link = item.find_element(By.CSS_SELECTOR, "a.ef-name-col__link")
-                    file_url = file_link.get_attribute("href")
-                    
-                    # Download the file
-                    self._download_file(file_url, os.path.join(current_dir, safe_file_name))
-            except Exception as e:
+                file_count += 1
+                safe_file_name = self._sanitize_filename(item["name"])
+                if item["href"]:
+                    self._download_file(item["href"], os.path.join(current_dir, safe_file_name))
+            except (WebDriverException, requests.RequestException, OSError) as e:
                 logger.error(f"Error processing file: {str(e)}")
-                logger.debug(traceback.format_exc())
+                logger.debug("Traceback:", exc_info=True)
                 
         logger.info(f"Processed {file_count} files in '{folder_name}'")
     
-    def _download_file(self, file_url, file_path):
-        """Download a file from Canvas"""
+    def _index_existing(self, course_dir):
+        """Index every non-empty file already downloaded for this course"""
+        self._known_files = {
+            entry.path
+            for dirpath, _, _ in os.walk(course_dir)
+            for entry in os.scandir(dirpath)
+            if entry.is_file() and entry.stat().st_size > 0
+        }
+        
+    def _derive_filename(self, url, text, fallback=""):
+        """Derive a safe local filename from link text, the URL path, or a fallback.
+        
+        Factors out the filename logic that was copy-pasted into every
+        link-processing loop.
+        """
+        file_name = text
+        if not file_name and url:
+            file_name = os.path.basename(urlparse(url).path)
+            file_name = file_name.split("?")[0]  # Remove query parameters
+            file_name = unquote(file_name)  # URL decode
+        if not file_name:
+            file_name = fallback
+        
+        safe_file_name = self._sanitize_filename(file_name)
+        if not safe_file_name.endswith(_DOC_EXTS):
+            safe_file_name += '.pdf'  # Default extension if none is detected
+        return safe_file_name
+        
+    def _download_file(self, file_url, file_path, direct=False):
+        """Queue a file for download.
+        
+        Direct file URLs go straight into the queue; preview-page URLs are
+        resolved to their real download URL through the browser first
+        (callers that already hold a known-direct URL pass direct=True).
+        The actual byte transfer happens later in _drain_downloads so many
+        files move in parallel instead of one at a time.
+        """
         file_name = os.path.basename(file_path)
         try:
-            # Check if file already exists and skip if needed
-            if self.skip_existing and os.path.exists(file_path):
-                file_size = os.path.getsize(file_path)
-                if file_size > 0:  # Only skip if the file has content
+            # Check if file already exists and skip if needed. The course
+            # index answers most probes without touching the filesystem;
+            # files created mid-run fall through to a single stat call.
+            if self.skip_existing:
+                if file_path in self._known_files:
+                    logger.info(f"Skipping existing file: {file_name}")
+                    return True
+                try:
+                    local_size = os.stat(file_path).st_size
+                except FileNotFoundError:
+                    local_size = 0
+                # Only skip if the file has content and still matches what
+                # the server reported when it was downloaded
+                if local_size and self._verify_existing(file_url, file_path, local_size, direct):
+                    self._known_files.add(file_path)
                     logger.info(f"Skipping existing file: {file_name}")
                     return True
             
-            # Click on the file to get to the file preview page
-            logger.info(f"Navigating to file: {file_name}")
-            self.driver.get(file_url)
-            time.sleep(self.delay)  # Add delay for visibility
+            # The same file is often reachable from several pages; queueing
+            # it twice would have two workers writing the same path
+            if file_path in self._queued_paths:
+                return True
+            
+            download_url = file_url
+            if not direct and not self._is_downloadable_link(file_url):
+                download_url = self._resolve_download_url(file_url, file_name)
+                if not download_url:
+                    return False
             
-            # Take a screenshot of the file preview page
-            self._take_screenshot(f"file_preview_{self._sanitize_filename(file_name)}")
+            self._queued_paths.add(file_path)
+            self._pending_downloads.append((download_url, file_path))
+            return True
             
-            # Wait for the download button to appear
+        except (TimeoutException, WebDriverException, requests.RequestException, OSError) as e:
+            logger.error(f"Error queueing file {file_name}: {str(e)}")
+            logger.debug("Traceback:", exc_info=True)
+            self._take_screenshot(f"download_error_{self._sanitize_filename(file_name)}")
+            return False
+            
+    def _resolve_download_url(self, file_url, file_name):
+        """Resolve a file preview URL to the real download URL.
+        
+        Preview URLs embed the file ID, so one authenticated request to
+        /api/v1/files/{id} returns the signed download link directly.
+        The browser round trip below only runs when the API says no.
+        """
+        match = _FILE_ID_RE.search(file_url)
+        if match:
+            try:
+                response = self.session.get(
+                    f"{self.canvas_url}/api/v1/files/{match.group(1)}", timeout=30)
+                if response.ok:
+                    text = response.text
+                    if text.startswith("while(1);"):
+                        text = text[len("while(1);"):]
+                    api_url = json.loads(text).get("url")
+                    if api_url:
+                        return api_url
+                logger.debug(f"Files API lookup returned {response.status_code} for {file_name}")
+            except (requests.RequestException, ValueError) as e:
+                logger.debug(f"Files API lookup failed for {file_name}: {str(e)}")
+        
+        # Fall back to walking the preview page in the browser; the
+        # WebDriverWait below is the only settle time the page needs
+        logger.info(f"Navigating to file: {file_name}")
+        self.driver.get(file_url)
+        
+        # Wait for the download button to appear
+        try:
+            logger.info("Looking for download button...")
+            download_button = WebDriverWait(self.driver, self.wait_timeout).until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, "a.icon-download"))
+            )
+            logger.info("Found primary download button")
+        except TimeoutException:
+            # Try alternative download button selectors
             try:
-                logger.info("Looking for download button...")
-                download_button = WebDriverWait(self.driver, 15).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, "a.icon-download"))
+                logger.info("Primary download button not found, trying alternatives...")
+                # The page has already rendered by now, so the alternative
+                # selectors either exist immediately or never will
+                download_button = WebDriverWait(self.driver, self.wait_alt_timeout).until(
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, ".file_download_btn, .file-download-btn, a[download]"))
                 )
-                logger.info("Found primary download button")
+                logger.info("Found alternative download button")
             except TimeoutException:
-                # Try alternative download button selectors
-                try:
-                    logger.info("Primary download button not found, trying alternatives...")
-                    download_button = WebDriverWait(self.driver, 10).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, ".file_download_btn, .file-download-btn, a[download]"))
-                    )
-                    logger.info("Found alternative download button")
-                except TimeoutException:
-                    # If we can't find a download button, try to get the file directly
-                    logger.warning(f"No download button found for {file_name}. Trying direct download...")
-                    self._take_screenshot(f"no_download_button_{self._sanitize_filename(file_name)}")
-                    response = self.session.get(file_url, stream=True)
-                    if response.status_code == 200:
-                        self._save_file_with_progress(response, file_path)
-                        return True
-                    else:
-                        logger.error(f"Failed to download file: {file_name}")
-                        return False
-            
-            # Get the actual download URL
-            download_url = download_button.get_attribute("href")
-            logger.info(f"Got download URL for {file_name}")
-            
-            # Download the file using requests
-            logger.info(f"Downloading: {file_name}")
-            response = self.session.get(download_url, stream=True)
-            response.raise_for_status()
-            
-            # Save the file with progress bar
-            self._save_file_with_progress(response, file_path)
-            return True
+                # If we can't find a download button, fall back to the file URL itself
+                logger.warning(f"No download button found for {file_name}. Trying direct download...")
+                self._take_screenshot(f"no_download_button_{self._sanitize_filename(file_name)}")
+                return file_url
+        
+        return download_button.get_attribute("href")
+        
+    def _drain_downloads(self):
+        """Download everything queued for the current course concurrently"""
+        if not self._pending_downloads:
+            return
+        pending, self._pending_downloads = self._pending_downloads, []
+        
+        if aiohttp is None:
+            # Still concurrent without aiohttp: requests-based downloads
+            # are pure I/O, and each worker thread gets its own session
+            logger.warning("aiohttp/aiofiles not installed, downloading on a thread pool...")
+            with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_DOWNLOADS) as pool:
+                for download_url, file_path in pending:
+                    pool.submit(self._download_file_sync, download_url, file_path)
+            return
+        
+        logger.info(f"Downloading {len(pending)} files with up to {MAX_CONCURRENT_DOWNLOADS} in flight...")
+        asyncio.run(self._download_pool(pending))
+        
+    async def _download_pool(self, pending):
+        """Run the queued downloads over a shared aiohttp session"""
+        # The browser cookies were already exported to the requests session;
+        # hand the same ones to aiohttp so the pool is authenticated
+        cookies = self.session.cookies.get_dict()
+        connector = aiohttp.TCPConnector(limit=MAX_CONCURRENT_DOWNLOADS * 2, ttl_dns_cache=300)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+        
+        async with aiohttp.ClientSession(cookies=cookies, connector=connector,
+                                         headers=dict(self.session.headers)) as session:
+            if hasattr(asyncio, "TaskGroup"):
+                # TaskGroup (3.11+) gives structured shutdown: nothing
+                # leaks if the pool itself is cancelled mid-course
+                async with asyncio.TaskGroup() as tg:
+                    for download_url, file_path in pending:
+                        tg.create_task(
+                            self._download_worker(session, semaphore, download_url, file_path))
+            else:
+                await asyncio.gather(*(
+                    self._download_worker(session, semaphore, download_url, file_path)
+                    for download_url, file_path in pending
+                ))
             
+    async def _download_worker(self, session, semaphore, download_url, file_path):
+        """Stream one queued file to disk (runs inside the download pool)"""
+        file_name = os.path.basename(file_path)
+        async with semaphore:
+            try:
+                async with session.get(download_url) as response:
+                    response.raise_for_status()
+                    # aiofiles hands the writes to its thread pool, so the
+                    # event loop keeps pulling other downloads off their
+                    # sockets while this file hits the disk; 1 MiB chunks
+                    # keep the per-chunk switching overhead negligible
+                    # Stream into a .part file and rename only on success,
+                    # so an interrupted transfer never leaves a truncated
+                    # file that a later skip check would trust
+                    async with aiofiles.open(file_path + ".part", "wb") as f:
+                        async for chunk in response.content.iter_chunked(1 << 20):
+                            await f.write(chunk)
+                    os.replace(file_path + ".part", file_path)
+                    self._record_download(file_path, response.headers.get("ETag"),
+                                          int(response.headers.get("Content-Length", 0)))
+                logger.info(f"Downloaded: {file_name}")
+            except Exception as e:
+                logger.error(f"Error downloading file {file_name}: {str(e)}")
+                self._record_failure(download_url, file_path, e)
+                
+    def _download_file_sync(self, download_url, file_path):
+        """Sequential fallback used when the async pool is unavailable.
+        
+        Uses the shared keep-alive session, so consecutive files reuse one
+        TLS connection instead of paying a handshake each, and streams the
+        body so memory stays flat regardless of file size.
+        """
+        file_name = os.path.basename(file_path)
+        try:
+            logger.info(f"Downloading: {file_name}")
+            with self.session.get(download_url, stream=True, timeout=60) as response:
+                response.raise_for_status()
+                self._save_file_with_progress(response, file_path)
+                self._record_download(file_path, response.headers.get("ETag"),
+                                      int(response.headers.get("Content-Length", 0)))
         except Exception as e:
             logger.error(f"Error downloading file {file_name}: {str(e)}")
-            logger.debug(traceback.format_exc())
-            self._take_screenshot(f"download_error_{self._sanitize_filename(file_name)}")
+            logger.debug("Traceback:", exc_info=True)
+            self._record_failure(download_url, file_path, e)
             
-            # Create an empty placeholder file to indicate we tried to download it
-            try:
-                with open(file_path, "wb") as f:
-                    pass
-                logger.info(f"Created empty placeholder for failed download: {file_name}")
-            except Exception as write_error:
-                logger.error(f"Failed to create placeholder file: {str(write_error)}")
-            return False
+    def _save_failure_report(self):
+        """Write failures.json so a rerun (or the user) can see what to retry"""
+        report_path = os.path.join(self.base_download_dir, "failures.json")
+        try:
+            if self._failures:
+                with open(report_path, "w") as f:
+                    json.dump(self._failures, f, indent=2)
+                logger.warning(f"{len(self._failures)} downloads failed; see {report_path}")
+            elif os.path.exists(report_path):
+                os.remove(report_path)
+        except OSError as e:
+            logger.warning(f"Could not write failure report: {str(e)}")
+            
+    def _record_failure(self, download_url, file_path, error):
+        """Note a failed download for the failures.json report"""
+        self._failures.append({
+            "url": download_url,
+            "path": file_path,
+            "error": str(error),
+        })
             
     def _save_file_with_progress(self, response, file_path):
         """Save a file with a progress bar"""
@@ -1306,44 +2146,39 @@ class CanvasScraper:
         # Get the file size if available
         file_size = int(response.headers.get('content-length', 0))
         
-        # Create a progress bar
-        progress = tqdm(total=file_size, unit='B', unit_scale=True, desc=file_name)
-        
-        # Save the file
-        with open(file_path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    progress.update(len(chunk))
+        # copyfileobj runs the read/write loop in C with a 1 MiB buffer,
+        # so large bodies move without a Python bytecode trip per chunk;
+        # decode_content keeps gzip/brotli transfer decoding intact and
+        # tqdm hooks the write side for progress. The bytes land in a
+        # .part file renamed into place only on success, so an interrupted
+        # transfer never leaves a truncated file the skip check would trust.
+        part_path = file_path + ".part"
+        with open(part_path, "wb") as f:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            response.raw.decode_content = True
+            if file_size and sys.stderr.isatty():
+                with tqdm.wrapattr(f, "write", total=file_size, desc=file_name) as out:
+                    shutil.copyfileobj(response.raw, out, length=1 << 20)
+            else:
+                # No bar when the length is unknown (it could only spin) or
+                # output is redirected - skips the per-chunk redraw work
+                shutil.copyfileobj(response.raw, f, length=1 << 20)
+        os.replace(part_path, file_path)
         
-        progress.close()
         logger.info(f"Downloaded: {file_name} ({self._format_size(file_size)})")
         
     def _format_size(self, size_bytes):
         """Format file size in a human-readable format"""
-        if size_bytes == 0:
+        if size_bytes <= 0:
             return "0B"
-        size_names = ("B", "KB", "MB", "GB", "TB")
-        i = int(math.log(size_bytes, 1024)) if size_bytes > 0 else 0
-        p = math.pow(1024, i)
-        s = round(size_bytes / p, 2)
-        return f"{s} {size_names[i]}"
+        # bit_length derives the unit index with integer math; the old
+        # math.log/math.pow pair could misplace exact 1024-boundary sizes
+        # through float rounding
+        i = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+        return f"{round(size_bytes / (1 << (10 * i)), 2)} {_SIZE_UNITS[i]}"
     
-    def _sanitize_filename(self, filename):
-        """Sanitize a filename to be safe for all operating systems"""
-        # Replace invalid characters with underscores
-        invalid_chars = ['<', '>', ':', '"', '/', '\\', '|', '?', '*']
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
-        
-        # Trim leading/trailing spaces and periods
-        filename = filename.strip('. ')
-        
-        # Ensure the filename is not empty
-        if not filename:
-            filename = "unnamed"
-            
-        return filename
+    _sanitize_filename = staticmethod(_sanitize_filename_impl)
     
     def run(self):
         """Run the full scraping process"""
@@ -1352,38 +2187,60 @@ class CanvasScraper:
             os.makedirs(self.base_download_dir, exist_ok=True)
             logger.info(f"Created download directory: {os.path.abspath(self.base_download_dir)}")
             
+            # Reuse scraping results from earlier runs
+            self._load_visited_cache()
+            self._load_etag_cache()
+            
             # Login to Canvas
             if not self.login():
                 logger.error("Login failed. Exiting.")
                 return False
             
-            # Get all available courses
-            courses = self.get_courses()
-            if not courses:
+            # Process the courses - in parallel across a Selenium Grid pool
+            # when one is configured, otherwise one at a time as the course
+            # listing generator yields them
+            course_count = 0
+            if self.grid_url and self.workers > 1:
+                courses = list(self.get_courses())
+                course_count = len(courses)
+                if courses:
+                    logger.info(f"Processing {course_count} courses across {self.workers} browsers...")
+                    self._init_driver_pool()
+                    try:
+                        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                            list(pool.map(self._process_course_with_pooled_driver, courses))
+                    finally:
+                        self._shutdown_driver_pool()
+            else:
+                for course in self.get_courses():
+                    course_count += 1
+                    logger.info(f"Processing course {course_count}: {course['name']}")
+                    self.process_course(course)
+            
+            if not course_count:
                 logger.error("No courses found. Exiting.")
                 return False
             
-            logger.info(f"Found {len(courses)} courses to process")
-            
-            # Process each course
-            for i, course in enumerate(courses, 1):
-                logger.info(f"Processing course {i} of {len(courses)}: {course['name']}")
-                self.process_course(course)
-            
             logger.info(f"\nAll files have been downloaded to: {os.path.abspath(self.base_download_dir)}")
             return True
             
         except Exception as e:
             logger.error(f"An error occurred during the scraping process: {str(e)}")
-            logger.error(traceback.format_exc())
+            logger.error("Traceback:", exc_info=True)
             return False
             
         finally:
+            self._save_visited_cache()
+            self._save_etag_cache()
+            self._save_failure_report()
+            
             # Close the browser
             if self.driver:
                 logger.info("Closing browser...")
                 self.driver.quit()
                 logger.info("Browser closed.")
+            if self._screenshot_pool:
+                self._screenshot_pool.shutdown(wait=True)
 
 def parse_args():
     """Parse command line arguments"""
@@ -1396,6 +2253,13 @@ def parse_args():
     parser.add_argument("--no-skip", action="store_true", help="Don't skip existing files (re-download all)")
     parser.add_argument("--headless", action="store_true", help="Run Chrome in headless mode (no visible browser)")
     parser.add_argument("--delay", type=int, default=2, help="Delay in seconds between actions for visibility (default: 2)")
+    parser.add_argument("--debug-visibility", action="store_true", help="Pause between actions so you can watch the browser (slower)")
+    parser.add_argument("--grid-url", help="Selenium Grid hub URL (e.g., http://localhost:4444/wd/hub) to scrape courses in parallel")
+    parser.add_argument("--workers", type=int, default=4, help="Parallel browsers to use with --grid-url (default: 4)")
+    parser.add_argument("--wait-timeout", type=int, default=8,
+                        help="Seconds to wait for primary page elements (default: 8)")
+    parser.add_argument("--wait-alt-timeout", type=int, default=2,
+                        help="Seconds to wait for fallback selectors on rendered pages (default: 2)")
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
     
     return parser.parse_args()
@@ -1441,7 +2305,9 @@ def main():
         skip_existing = input("Skip existing files? (Y/n): ").lower() != 'n'
     
     # Create and run the scraper
-    scraper = CanvasScraper(canvas_url, username, password, download_dir, skip_existing, args.headless, args.delay)
+    scraper = CanvasScraper(canvas_url, username, password, download_dir, skip_existing, args.headless, args.delay,
+                            debug_visibility=args.debug_visibility, grid_url=args.grid_url, workers=args.workers,
+                            wait_timeout=args.wait_timeout, wait_alt_timeout=args.wait_alt_timeout)
     
     logger.info("\nStarting Canvas scraper...")
     logger.info("This will open a Chrome browser window and log in to Canvas.")
@@ -1466,7 +2332,7 @@ def main():
             logger.info("=" * 60)
     except Exception as e:
         logger.error(f"Unhandled exception: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.error("Traceback:", exc_info=True)
         logger.info("\n" + "=" * 60)
         logger.info("Canvas scraper encountered a critical error.")
         logger.info(f"Check the log file for details: {os.path.abspath(log_filename)}")